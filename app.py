@@ -460,8 +460,17 @@ def handle_options(path):
 
 @app.route('/api/templates', methods=['GET'])
 def get_templates():
-    """Get all templates"""
-    templates = db.get_all_templates()
+    """Get all templates, optionally filtered by builtin status and limited"""
+    is_builtin = request.args.get('is_builtin')
+    limit = request.args.get('limit', type=int)
+    if limit is not None and limit < 0:
+        return jsonify({'error': 'limit must be a non-negative integer'}), 400
+    
+    # Convert is_builtin string to boolean if provided
+    if is_builtin is not None:
+        is_builtin = is_builtin.lower() in ['true', '1', 'yes']
+    
+    templates = db.get_all_templates(is_builtin=is_builtin, limit=limit)
     return jsonify(templates)
 
 @app.route('/api/templates/<int:template_id>', methods=['GET'])
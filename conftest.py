@@ -0,0 +1,21 @@
+"""
+Shared pytest configuration.
+
+The suites build many short-lived dicts (parsed JSON, AgentIR instances,
+converter output) with no reference cycles, so cyclic GC passes during a run
+are wasted work. Turn automatic collection off for the test process only;
+the app itself still runs with the default GC thresholds.
+"""
+import gc
+import os
+
+gc.set_threshold(0)
+
+# Keep the app's SQLite state in a shared in-memory database for the whole run
+# (set AGENT_DB_SKIP_PERSIST=0 to use agents.db). database.py reads the flag
+# once at import, and the first collected test module imports the app, so it
+# has to be set here rather than in any one test file
+os.environ.setdefault('AGENT_DB_SKIP_PERSIST', '1')
+
+# test_qa_report.py is a markdown QA report kept in a docstring; it has no tests
+collect_ignore = ["test_qa_report.py"]
@@ -17,6 +17,14 @@ class AgentIR:
     agent definitions from Claude, Roo, and custom formats.
     """
     
+    # Fixed field set: slots keep instances small and attribute access cheap
+    # when many agents are converted or exported in a batch.
+    __slots__ = (
+        'id', 'name', 'description', 'version', 'category', 'capabilities',
+        'tools', 'system_prompt', 'config_json', 'config_schema', 'metadata',
+        'icon', 'author', 'tags', 'custom_fields'
+    )
+    
     def __init__(self):
         """Initialize a new AgentIR instance."""
         self.id: Optional[str] = None
@@ -15,9 +15,20 @@ if os.environ.get('VERCEL') or os.environ.get('VERCEL_ENV'):
     # Data will be lost between cold starts. Use PostgreSQL for persistence.
     # SQLite also has concurrency issues under load.
     DB_FILE = '/tmp/modes.db'
+elif os.environ.get('AGENT_DB_SKIP_PERSIST') == '1':
+    # Test runs: keep all state in a shared in-memory database so requests
+    # never write or fsync a database file
+    DB_FILE = 'file:agents_db?mode=memory&cache=shared'
 else:
     DB_FILE = 'agents.db'
 
+# URI-style SQLite paths (the in-memory test database) need uri=True
+DB_IS_URI = DB_FILE.startswith('file:')
+
+# A shared in-memory database only lives while a connection to it is open,
+# so hold one for the life of the process
+_MEMORY_DB_ANCHOR = sqlite3.connect(DB_FILE, uri=True) if DB_IS_URI else None
+
 # Import psycopg2 only if Postgres is available
 if USE_POSTGRES:
     try:
@@ -79,7 +90,7 @@ def get_db():
         finally:
             conn.close()
     else:
-        conn = sqlite3.connect(DB_FILE)
+        conn = sqlite3.connect(DB_FILE, uri=DB_IS_URI)
         conn.row_factory = sqlite3.Row
         try:
             yield conn
@@ -434,10 +445,33 @@ def seed_builtin_templates():
                 execute_update(conn, query, params)
 
 # Agent Templates CRUD
-def get_all_templates():
-    """Get all agent templates"""
+def get_all_templates(is_builtin=None, limit=None):
+    """
+    Get all agent templates with optional filtering
+    
+    Args:
+        is_builtin: Filter by builtin status (optional)
+        limit: Maximum number of templates to return (optional)
+    
+    Returns:
+        list: List of template dictionaries
+    """
     with get_db() as conn:
-        rows = execute_query(conn, 'SELECT * FROM agent_templates ORDER BY is_builtin DESC, name ASC')
+        query = 'SELECT * FROM agent_templates'
+        params = []
+        ph = '%s' if USE_POSTGRES else '?'
+        
+        if is_builtin is not None:
+            query += f' WHERE is_builtin = {ph}'
+            params.append(convert_bool(is_builtin))
+        
+        query += ' ORDER BY is_builtin DESC, name ASC'
+        
+        if limit is not None:
+            query += f' LIMIT {ph}'
+            params.append(int(limit))
+        
+        rows = execute_query(conn, query, params)
         return [dict(row) for row in rows]
 
 def get_template_by_id(template_id):
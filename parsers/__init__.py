@@ -9,6 +9,8 @@ import os
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Tuple, Optional
 
+from utils import yaml_safe_load
+
 
 class BaseParser(ABC):
     """
@@ -124,7 +126,7 @@ class YAMLParser(BaseParser):
         """
         try:
             import yaml
-            data = yaml.safe_load(content)
+            data = yaml_safe_load(content)
             if not isinstance(data, dict):
                 raise ValueError("YAML content must be a dictionary/object")
 
@@ -199,7 +201,7 @@ class MarkdownParser(BaseParser):
                 for i, line in enumerate(lines[1:], 1):
                     if line.strip() == '---':
                         frontmatter = '\n'.join(frontmatter_lines)
-                        data = yaml.safe_load(frontmatter) or {}
+                        data = yaml_safe_load(frontmatter) or {}
                         body_start = i + 1
                         break
                     frontmatter_lines.append(line)
@@ -368,7 +370,7 @@ def detect_format(filename: str, content: str = None) -> str:
         # Try to detect YAML
         try:
             import yaml
-            yaml.safe_load(content.strip())
+            yaml_safe_load(content.strip())
             return 'yaml'
         except:
             pass
@@ -6,6 +6,7 @@ custom application-specific agent format definitions into AgentIR.
 """
 
 from typing import Dict, Any, Tuple, List
+from utils import yaml_safe_load
 from . import BaseParser
 
 
@@ -36,7 +37,7 @@ class CustomParser(BaseParser):
             # Try YAML if JSON fails
             try:
                 import yaml
-                data = yaml.safe_load(content)
+                data = yaml_safe_load(content)
             except ImportError:
                 raise ValueError("PyYAML is not installed. Install it with: pip install PyYAML")
             except yaml.YAMLError as e:
@@ -5,10 +5,23 @@ This module provides the RooParser class for parsing
 Roo agent format definitions into AgentIR.
 """
 
-from typing import Dict, Any, Tuple, List
+from functools import lru_cache
+from typing import Dict, Any, Iterable, Tuple, List, Union
+from utils import yaml_safe_load
 from . import BaseParser
 
 
+# Fields that must be lists of strings / plain strings when present
+_LIST_FIELDS = ('capabilities', 'tools', 'tags')
+_STRING_FIELDS = ('version', 'category', 'icon')
+
+
+@lru_cache(maxsize=256)
+def _mode_to_name(mode: str) -> str:
+    """Convert a Roo mode slug (e.g. 'code-reviewer') to a readable name."""
+    return mode.replace('-', ' ').title()
+
+
 class RooParser(BaseParser):
     """Parser for Roo agent format."""
     
@@ -27,21 +40,27 @@ class RooParser(BaseParser):
         """
         from converters.ir import AgentIR  # Lazy import to avoid circular dependency
         
-        # First parse the content as JSON/YAML
+        # First parse the content as JSON/YAML. A JSON object or array must
+        # start with '{' or '[', so dispatch on the first non-whitespace
+        # character instead of letting json.loads fail on every YAML input.
         import json
-        try:
-            # Try JSON first
-            data = json.loads(content)
-        except json.JSONDecodeError:
-            # Try YAML if JSON fails
+        data = None
+        if content.lstrip()[:1] in ('{', '['):
+            try:
+                data = json.loads(content)
+            except json.JSONDecodeError:
+                # Could still be a YAML flow mapping/sequence
+                data = None
+
+        if data is None:
             try:
                 import yaml
-                data = yaml.safe_load(content)
+                data = yaml_safe_load(content)
             except ImportError:
                 raise ValueError("PyYAML is not installed. Install it with: pip install PyYAML")
             except yaml.YAMLError as e:
                 raise ValueError(f"Invalid YAML: {str(e)}")
-        
+
         if not isinstance(data, dict):
             raise ValueError("Roo agent content must be an object/dictionary")
         
@@ -59,8 +78,7 @@ class RooParser(BaseParser):
             ir.name = data['name']
         elif 'mode' in data:
             # Convert mode to a readable name
-            mode = data['mode']
-            ir.name = mode.replace('-', ' ').title()
+            ir.name = _mode_to_name(data['mode'])
         
         ir.description = data.get('description')
         ir.category = data.get('category')
@@ -97,6 +115,25 @@ class RooParser(BaseParser):
         
         return ir
     
+    def parse_many(self, docs: Iterable[Union[str, bytes]]) -> List['AgentIR']:
+        """
+        Parse many Roo agent definitions in one call.
+        
+        Args:
+            docs: Iterable of JSON/YAML documents (str or UTF-8 bytes)
+        
+        Returns:
+            list: AgentIR instances, in input order
+        
+        Raises:
+            ValueError: If any document fails to parse
+        """
+        parse = self.parse
+        return [
+            parse(doc.decode('utf-8') if isinstance(doc, bytes) else doc)
+            for doc in docs
+        ]
+    
     def validate(self, data: Dict[str, Any]) -> Tuple[bool, List[str]]:
         """
         Validate Roo agent format data.
@@ -107,6 +144,45 @@ class RooParser(BaseParser):
         Returns:
             tuple: (is_valid, list_of_errors)
         """
+        # Most inputs are valid; only build error messages when they are not
+        if self._fast_check(data):
+            return True, []
+        return self._detailed_errors(data)
+    
+    @staticmethod
+    def _fast_check(data: Dict[str, Any]) -> bool:
+        """Return True if data passes every check in _detailed_errors()."""
+        has_mode = 'mode' in data
+        has_name = 'name' in data
+        if not (has_mode or has_name):
+            return False
+        if (has_mode and not data['mode']) or (has_name and not data['name']):
+            return False
+        
+        get = data.get
+        if not get('description'):
+            return False
+        if not (get('system_prompt') or get('capabilities') or get('tools')):
+            return False
+        
+        for field in _LIST_FIELDS:
+            value = get(field)
+            if value and not (isinstance(value, list) and all(isinstance(item, str) for item in value)):
+                return False
+        
+        metadata = get('metadata')
+        if metadata and not isinstance(metadata, dict):
+            return False
+        
+        for field in _STRING_FIELDS:
+            value = get(field)
+            if value and not isinstance(value, str):
+                return False
+        
+        return True
+    
+    def _detailed_errors(self, data: Dict[str, Any]) -> Tuple[bool, List[str]]:
+        """Run every validation check and collect the error messages."""
         errors = []
         
         # Roo format requires either 'mode' or 'name'
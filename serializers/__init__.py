@@ -6,8 +6,12 @@ serializers for converting AgentIR to different agent formats.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any
-from converters.ir import AgentIR
+from typing import TYPE_CHECKING, Any, BinaryIO, Dict, Iterable, Optional, Tuple
+
+from utils import json_dumps
+
+if TYPE_CHECKING:
+    from converters.ir import AgentIR
 
 
 class BaseSerializer(ABC):
@@ -19,13 +23,15 @@ class BaseSerializer(ABC):
     """
     
     @abstractmethod
-    def serialize(self, ir: AgentIR, output_format: str = 'json') -> Dict[str, Any]:
+    def serialize(self, ir: 'AgentIR', output_format: str = 'json',
+                  validate: bool = True) -> Dict[str, Any]:
         """
         Serialize AgentIR to target format.
         
         Args:
             ir: The AgentIR to serialize
             output_format: Output format ('json' or 'yaml')
+            validate: Whether to run ir.validate() before serializing
         
         Returns:
             dict: Serialized agent data
@@ -35,42 +41,140 @@ class BaseSerializer(ABC):
         """
         pass
     
-    def to_json(self, ir: AgentIR) -> str:
+    def to_json(self, ir: 'AgentIR', validate: bool = True) -> str:
         """
         Convert AgentIR to JSON string.
         
         Args:
             ir: The AgentIR to convert
+            validate: Whether to run ir.validate() before serializing
         
         Returns:
             str: JSON string representation
         """
-        import json
-        data = self.serialize(ir, 'json')
-        return json.dumps(data, indent=2)
+        data = self.serialize(ir, 'json', validate=validate)
+        return json_dumps(data, indent=True).decode('utf-8')
+    
+    def to_json_stream(self, ir: 'AgentIR', fp: BinaryIO, validate: bool = True) -> None:
+        """
+        Write AgentIR as JSON directly to a binary file handle.
+        
+        Args:
+            ir: The AgentIR to convert
+            fp: Binary file-like object to write to
+            validate: Whether to run ir.validate() before serializing
+        """
+        data = self.serialize(ir, 'json', validate=validate)
+        fp.write(json_dumps(data, indent=True))
+    
+    def to_json_many(self, irs: Iterable['AgentIR'], fp: BinaryIO,
+                     validate: bool = True) -> int:
+        """
+        Write AgentIRs as newline-delimited JSON to a binary file handle.
+        
+        Each agent is serialized and written as it is consumed from irs,
+        so large libraries are never materialized as one string.
+        
+        Args:
+            irs: Iterable of AgentIRs to convert
+            fp: Binary file-like object to write to
+            validate: Whether to run ir.validate() before serializing
+        
+        Returns:
+            int: Number of agents written
+        """
+        serialize = self.serialize
+        write = fp.write
+        count = 0
+        for ir in irs:
+            write(json_dumps(serialize(ir, 'json', validate=validate)))
+            write(b'\n')
+            count += 1
+        return count
     
-    def to_yaml(self, ir: AgentIR) -> str:
+    def to_yaml(self, ir: 'AgentIR', validate: bool = True) -> str:
         """
         Convert AgentIR to YAML string.
         
         Args:
             ir: The AgentIR to convert
+            validate: Whether to run ir.validate() before serializing
         
         Returns:
             str: YAML string representation
         """
         try:
             import yaml
-            data = self.serialize(ir, 'yaml')
+            data = self.serialize(ir, 'yaml', validate=validate)
             return yaml.dump(data, default_flow_style=False, indent=2)
         except ImportError:
             raise ValueError("PyYAML is not installed. Install it with: pip install PyYAML")
 
 
-# Import format-specific serializers
-from .claude import ClaudeSerializer
-from .roo import RooSerializer
-from .custom import CustomSerializer
+# Field-map default meaning "emit a fresh empty list". Serialized data must
+# hold real lists (tuples would not round-trip through yaml.dump), and a
+# literal [] avoids a factory call per missing field.
+_EMPTY_LIST = object()
+
+
+def _emit(ir: 'AgentIR', field_map: Tuple[Tuple[str, str, Any], ...],
+          data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Build serialized agent data from a field-copy table.
+    
+    Args:
+        ir: The AgentIR to serialize
+        field_map: Tuple of (ir_attribute, output_key, default) entries. Falsy
+            attributes are skipped unless a default is given; _EMPTY_LIST
+            emits a new empty list and a callable default is called with
+            the IR to build a fresh value.
+        data: Optional dict of leading keys to emit before the common fields
+    
+    Returns:
+        dict: Serialized agent data
+    """
+    if data is None:
+        data = {}
+    data['name'] = ir.name
+    data['description'] = ir.description
+    data['version'] = ir.version
+    
+    for src, dst, default in field_map:
+        value = getattr(ir, src)
+        if value:
+            data[dst] = value
+        elif default is _EMPTY_LIST:
+            data[dst] = []
+        elif default is not None:
+            data[dst] = default(ir) if callable(default) else default
+    
+    # Add metadata if present
+    metadata = ir.metadata
+    if metadata:
+        data['metadata'] = metadata
+    
+    # Add custom fields
+    data.update(ir.custom_fields)
+    
+    return data
+
+
+# Format-specific serializers are imported lazily on first attribute access
+_LAZY_SERIALIZERS = {
+    'ClaudeSerializer': '.claude',
+    'RooSerializer': '.roo',
+    'CustomSerializer': '.custom'
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_SERIALIZERS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
 
 __all__ = [
     'BaseSerializer',
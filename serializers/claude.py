@@ -5,21 +5,35 @@ This module provides the ClaudeSerializer class for converting
 AgentIR to Claude agent format.
 """
 
-from typing import Dict, Any
-from . import BaseSerializer
-from converters.ir import AgentIR
+from typing import TYPE_CHECKING, Dict, Any
+from . import BaseSerializer, _emit
+
+if TYPE_CHECKING:
+    from converters.ir import AgentIR
 
 
 class ClaudeSerializer(BaseSerializer):
     """Serializer for Claude agent format."""
     
-    def serialize(self, ir: AgentIR, output_format: str = 'json') -> Dict[str, Any]:
+    # (ir_attribute, output_key, default) entries emitted after version
+    _FIELD_MAP = (
+        ('capabilities', 'capabilities', None),
+        ('tools', 'tools', None),
+        ('system_prompt', 'system_prompt', None),
+        ('config_schema', 'config_schema', None),
+        ('config_json', 'config', None),
+    )
+    
+    def serialize(self, ir: 'AgentIR', output_format: str = 'json',
+                  validate: bool = True) -> Dict[str, Any]:
         """
         Serialize AgentIR to Claude agent format.
         
         Args:
             ir: The AgentIR to serialize
             output_format: Output format ('json' or 'yaml')
+            validate: Whether to validate the IR first. Callers that have
+                already validated it (e.g. in a bulk export loop) can skip it.
         
         Returns:
             dict: Serialized Claude agent data
@@ -28,41 +42,13 @@ class ClaudeSerializer(BaseSerializer):
             ValueError: If serialization fails
         """
         # Validate the IR first
-        is_valid, errors = ir.validate()
-        if not is_valid:
-            raise ValueError(f"Invalid AgentIR: {', '.join(errors)}")
+        if validate:
+            is_valid, errors = ir.validate()
+            if not is_valid:
+                raise ValueError(f"Invalid AgentIR: {', '.join(errors)}")
         
         # Build Claude format data
-        data = {
-            'name': ir.name,
-            'description': ir.description,
-            'version': ir.version
-        }
-        
-        # Add optional fields if they have values
-        if ir.capabilities:
-            data['capabilities'] = ir.capabilities
-        
-        if ir.tools:
-            data['tools'] = ir.tools
-        
-        if ir.system_prompt:
-            data['system_prompt'] = ir.system_prompt
-        
-        if ir.config_schema:
-            data['config_schema'] = ir.config_schema
-        
-        if ir.config_json:
-            data['config'] = ir.config_json
-        
-        # Add metadata if present
-        if ir.metadata:
-            data['metadata'] = ir.metadata
-        
-        # Add custom fields
-        data.update(ir.custom_fields)
-        
-        return data
+        return _emit(ir, self._FIELD_MAP)
     
     @classmethod
     def get_format_name(cls) -> str:
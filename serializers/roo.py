@@ -5,21 +5,52 @@ This module provides the RooSerializer class for converting
 AgentIR to Roo agent format.
 """
 
-from typing import Dict, Any
-from . import BaseSerializer
-from converters.ir import AgentIR
+import string
+from typing import TYPE_CHECKING, Dict, Any
+from . import BaseSerializer, _EMPTY_LIST, _emit
+
+if TYPE_CHECKING:
+    from converters.ir import AgentIR
+
+
+# Lowercases ASCII letters and maps spaces to dashes in a single pass
+_MODE_TRANS = str.maketrans(
+    {**{c: c.lower() for c in string.ascii_uppercase}, ' ': '-'}
+)
+
+
+def _name_to_mode(name: str) -> str:
+    """Convert an agent name to a Roo mode slug (e.g. 'Code Reviewer' -> 'code-reviewer')."""
+    if name.isascii():
+        return name.translate(_MODE_TRANS)
+    # Non-ASCII names need full Unicode lowercasing
+    return name.lower().replace(' ', '-')
 
 
 class RooSerializer(BaseSerializer):
     """Serializer for Roo agent format."""
     
-    def serialize(self, ir: AgentIR, output_format: str = 'json') -> Dict[str, Any]:
+    # (ir_attribute, output_key, default) entries emitted after version
+    _FIELD_MAP = (
+        ('category', 'category', 'general'),
+        ('icon', 'icon', 'fa-robot'),
+        ('tags', 'tags', _EMPTY_LIST),
+        ('capabilities', 'capabilities', None),
+        ('tools', 'tools', None),
+        ('system_prompt', 'system_prompt', None),
+        ('config_json', 'config', None),
+    )
+    
+    def serialize(self, ir: 'AgentIR', output_format: str = 'json',
+                  validate: bool = True) -> Dict[str, Any]:
         """
         Serialize AgentIR to Roo agent format.
         
         Args:
             ir: The AgentIR to serialize
             output_format: Output format ('json' or 'yaml')
+            validate: Whether to validate the IR first. Callers that have
+                already validated it (e.g. in a bulk export loop) can skip it.
         
         Returns:
             dict: Serialized Roo agent data
@@ -28,45 +59,14 @@ class RooSerializer(BaseSerializer):
             ValueError: If serialization fails
         """
         # Validate the IR first
-        is_valid, errors = ir.validate()
-        if not is_valid:
-            raise ValueError(f"Invalid AgentIR: {', '.join(errors)}")
-        
-        # Build Roo format data
-        data = {
-            'mode': ir.name.lower().replace(' ', '-'),
-            'name': ir.name,
-            'description': ir.description,
-            'version': ir.version
-        }
-        
-        # Add optional fields with defaults if needed
-        data['category'] = ir.category or 'general'
-        data['icon'] = ir.icon or 'fa-robot'
-        data['tags'] = ir.tags if ir.tags else []
-        
-        # Add capabilities and tools if present
-        if ir.capabilities:
-            data['capabilities'] = ir.capabilities
-        
-        if ir.tools:
-            data['tools'] = ir.tools
-        
-        if ir.system_prompt:
-            data['system_prompt'] = ir.system_prompt
-        
-        # Add config if present
-        if ir.config_json:
-            data['config'] = ir.config_json
-        
-        # Add metadata if present
-        if ir.metadata:
-            data['metadata'] = ir.metadata
-        
-        # Add custom fields
-        data.update(ir.custom_fields)
+        if validate:
+            is_valid, errors = ir.validate()
+            if not is_valid:
+                raise ValueError(f"Invalid AgentIR: {', '.join(errors)}")
         
-        return data
+        # Build Roo format data, leading with the mode identifier
+        data = {'mode': _name_to_mode(ir.name)}
+        return _emit(ir, self._FIELD_MAP, data)
     
     @classmethod
     def get_format_name(cls) -> str:
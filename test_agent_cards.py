@@ -10,7 +10,6 @@ This test file covers:
 """
 
 import unittest
-import json
 import os
 import sys
 
@@ -18,6 +17,7 @@ import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
 
 from generators import AgentCardGenerator
+from utils import json_dumps, json_loads
 
 
 class TestAgentCardGenerator(unittest.TestCase):
@@ -56,10 +56,10 @@ class TestAgentCardGenerator(unittest.TestCase):
         config_data = {
             'id': 1,
             'name': 'Test Configuration',
-            'config_json': json.dumps({
+            'config_json': json_dumps({
                 'capabilities': ['code_generation', 'testing'],
                 'tools': ['python', 'pytest']
-            }),
+            }).decode('utf-8'),
             'template_name': 'Test Template',
             'created_at': '2026-02-08T00:00:00Z',
             'updated_at': '2026-02-08T00:00:00Z'
@@ -83,8 +83,8 @@ class TestAgentCardGenerator(unittest.TestCase):
             'id': 1,
             'name': 'Test Agent',
             'description': 'A test custom agent',
-            'capabilities': json.dumps(['code_review', 'debugging']),
-            'tools': json.dumps(['git', 'docker']),
+            'capabilities': json_dumps(['code_review', 'debugging']).decode('utf-8'),
+            'tools': json_dumps(['git', 'docker']).decode('utf-8'),
             'created_at': '2026-02-08T00:00:00Z',
             'updated_at': '2026-02-08T00:00:00Z'
         }
@@ -198,7 +198,7 @@ class TestAgentCardGenerator(unittest.TestCase):
         exported = AgentCardGenerator.export_card(card_data, 'json')
         
         # Verify it's valid JSON
-        parsed = json.loads(exported)
+        parsed = json_loads(exported)
         self.assertEqual(parsed['agent']['id'], 'test-1')
     
     def test_export_card_yaml(self):
@@ -240,7 +240,7 @@ class TestAgentCardGenerator(unittest.TestCase):
     
     def test_import_card_json(self):
         """Test importing agent card from JSON"""
-        card_json = json.dumps({
+        card_json = json_dumps({
             '$schema': AgentCardGenerator.SCHEMA_URL,
             'agent': {
                 'id': 'test-1',
@@ -249,7 +249,7 @@ class TestAgentCardGenerator(unittest.TestCase):
                 'version': '1.0.0',
                 'category': 'Testing'
             }
-        })
+        }).decode('utf-8')
         
         card_data = AgentCardGenerator.import_card(card_json, 'json')
         
@@ -300,7 +300,16 @@ def run_tests():
     print("\n" + "="*60)
     print("Agent Card Generator Tests")
     print("="*60)
-    
+
+    # The tests are independent, so run them in parallel when pytest-xdist is available
+    try:
+        import pytest
+        import xdist  # noqa: F401
+    except ImportError:
+        pass
+    else:
+        return pytest.main(['-n', 'auto', __file__]) == 0
+
     # Create test suite
     suite = unittest.TestLoader().loadTestsFromTestCase(TestAgentCardGenerator)
     
@@ -2,149 +2,230 @@
 Test script for agents, teams, and ratings API endpoints
 """
 import requests
-import json
+import functools
+import io
+import logging
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 BASE_URL = "http://localhost:5000"
+JSON_HEADERS = {"Content-Type": "application/json"}
 
-def test_create_agent():
-    """Test creating an agent"""
-    print("\n=== Testing Agent Creation ===")
-
-    agent_data = {
-        "slug": "code-helper",
-        "name": "Code Helper",
-        "description": "A helpful coding assistant that can read, write, and edit files",
-        "instructions": "You are a helpful coding assistant. You can read files, write new code, and make edits to existing code. Always explain your changes and follow best practices.",
-        "tools": ["Read", "Write", "Edit", "Grep"],
-        "skills": ["Python", "JavaScript", "Testing"],
-        "default_model": "sonnet",
-        "max_turns": 50,
-        "metadata": {
-            "author": "Test User",
-            "version": "1.0.0"
+log = logging.getLogger(__name__)
+
+# Pretty-print response bodies only when asked to
+VERBOSE = os.environ.get("TEST_VERBOSE") == "1"
+
+from utils import json_dumps, json_loads
+
+def jdump(obj):
+    """Format obj as JSON; indented only when TEST_VERBOSE=1."""
+    return json_dumps(obj, indent=VERBOSE).decode('utf-8')
+
+def log_resp(response, out=print):
+    """Print a response's status and JSON body in one write and return the decoded body"""
+    body = json_loads(response.content)
+    out(f"Status: {response.status_code}\nResponse: {jdump(body)}")
+    return body
+
+# Prefer an HTTP/2-capable httpx client (needs httpx[http2]); HTTP/2 is only
+# negotiated over TLS, so plain-http servers still get pooled HTTP/1.1
+try:
+    import httpx
+    # With an explicit transport the client ignores its own http2/limits
+    # arguments, so they go on the transport
+    SESSION = httpx.Client(
+        transport=httpx.HTTPTransport(
+            http2=True,
+            limits=httpx.Limits(max_connections=16, max_keepalive_connections=16),
+            retries=3
+        )
+    )
+except ImportError:
+    httpx = None
+    # One keep-alive session for every call so tests reuse the same connection
+    SESSION = requests.Session()
+    SESSION.headers["Connection"] = "keep-alive"
+    # Size the pool for the concurrent phases and retry transient gateway errors
+    # on the same pooled connections
+    _ADAPTER = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(total=3, backoff_factor=0.1, status_forcelist=[502, 503, 504])
+    )
+    SESSION.mount("http://", _ADAPTER)
+    SESSION.mount("https://", _ADAPTER)
+
+def post_json(url, body, headers=JSON_HEADERS):
+    """POST pre-encoded JSON bytes on the shared session"""
+    if httpx is not None:
+        return SESSION.post(url, content=body, headers=headers)
+    return SESSION.post(url, data=body, headers=headers)
+
+# Request bodies are encoded once at import
+_AGENT_BODY = json_dumps({
+    "slug": "code-helper",
+    "name": "Code Helper",
+    "description": "A helpful coding assistant that can read, write, and edit files",
+    "instructions": "You are a helpful coding assistant. You can read files, write new code, and make edits to existing code. Always explain your changes and follow best practices.",
+    "tools": ["Read", "Write", "Edit", "Grep"],
+    "skills": ["Python", "JavaScript", "Testing"],
+    "default_model": "sonnet",
+    "max_turns": 50,
+    "metadata": {
+        "author": "Test User",
+        "version": "1.0.0"
+    }
+})
+
+_RATING_AGENT_BODY = json_dumps({
+    "rating": 5,
+    "review": "Excellent agent! Very helpful for coding tasks."
+})
+
+_TEAM_BODY = json_dumps({
+    "slug": "dev-team",
+    "name": "Development Team",
+    "description": "A team of agents for software development tasks",
+    "version": "1.0.0",
+    "agents": [
+        {
+            "slug": "code-helper",
+            "role": "developer",
+            "priority": 1
         }
+    ],
+    "workflow": {
+        "type": "sequential",
+        "stages": [
+            {
+                "name": "Development",
+                "agents": ["code-helper"]
+            }
+        ]
+    },
+    "metadata": {
+        "author": "Test User",
+        "created_for": "Testing"
     }
+})
+
+_RATING_TEAM_BODY = json_dumps({
+    "rating": 4,
+    "review": "Great team setup! Works well together."
+})
+
+def test_create_agent(out=print):
+    """Test creating an agent"""
+    out("\n=== Testing Agent Creation ===")
 
-    response = requests.post(f"{BASE_URL}/api/agents", json=agent_data)
-    print(f"Status: {response.status_code}")
-    print(f"Response: {json.dumps(response.json(), indent=2)}")
-    return response.json().get('id')
+    response = post_json(f"{BASE_URL}/api/agents", _AGENT_BODY)
+    return log_resp(response, out).get('id')
 
-def test_get_agents():
+def test_get_agents(out=print):
     """Test listing all agents"""
-    print("\n=== Testing Get All Agents ===")
+    out("\n=== Testing Get All Agents ===")
 
-    response = requests.get(f"{BASE_URL}/api/agents")
-    print(f"Status: {response.status_code}")
-    data = response.json()
-    print(f"Total agents: {data.get('total', 0)}")
+    response = SESSION.get(f"{BASE_URL}/api/agents")
+    out(f"Status: {response.status_code}")
+    data = json_loads(response.content)
+    out(f"Total agents: {data.get('total', 0)}")
     if data.get('agents'):
-        print(f"First agent: {json.dumps(data['agents'][0], indent=2)}")
+        out(f"First agent: {jdump(data['agents'][0])}")
 
-def test_get_agent(agent_id):
+def test_get_agent(agent_id, out=print):
     """Test getting a specific agent"""
-    print(f"\n=== Testing Get Agent {agent_id} ===")
+    out(f"\n=== Testing Get Agent {agent_id} ===")
 
-    response = requests.get(f"{BASE_URL}/api/agents/{agent_id}")
-    print(f"Status: {response.status_code}")
-    print(f"Response: {json.dumps(response.json(), indent=2)}")
+    response = SESSION.get(f"{BASE_URL}/api/agents/{agent_id}")
+    log_resp(response, out)
 
-def test_rate_agent(agent_id):
+def test_rate_agent(agent_id, out=print):
     """Test rating an agent"""
-    print(f"\n=== Testing Rate Agent {agent_id} ===")
-
-    rating_data = {
-        "rating": 5,
-        "review": "Excellent agent! Very helpful for coding tasks."
-    }
+    out(f"\n=== Testing Rate Agent {agent_id} ===")
 
-    response = requests.post(f"{BASE_URL}/api/agents/{agent_id}/rate", json=rating_data)
-    print(f"Status: {response.status_code}")
-    print(f"Response: {json.dumps(response.json(), indent=2)}")
+    response = post_json(f"{BASE_URL}/api/agents/{agent_id}/rate", _RATING_AGENT_BODY)
+    log_resp(response, out)
 
-def test_download_agent(agent_id):
+def test_download_agent(agent_id, out=print):
     """Test downloading an agent"""
-    print(f"\n=== Testing Download Agent {agent_id} ===")
+    out(f"\n=== Testing Download Agent {agent_id} ===")
 
-    response = requests.get(f"{BASE_URL}/api/agents/{agent_id}/download")
-    print(f"Status: {response.status_code}")
-    print(f"Response keys: {list(response.json().keys())}")
+    response = SESSION.get(f"{BASE_URL}/api/agents/{agent_id}/download")
+    out(f"Status: {response.status_code}\nResponse keys: {list(json_loads(response.content).keys())}")
 
-def test_create_team(agent_id):
+def test_create_team(agent_id, out=print):
     """Test creating a team"""
-    print("\n=== Testing Team Creation ===")
-
-    team_data = {
-        "slug": "dev-team",
-        "name": "Development Team",
-        "description": "A team of agents for software development tasks",
-        "version": "1.0.0",
-        "agents": [
-            {
-                "slug": "code-helper",
-                "role": "developer",
-                "priority": 1
-            }
-        ],
-        "workflow": {
-            "type": "sequential",
-            "stages": [
-                {
-                    "name": "Development",
-                    "agents": ["code-helper"]
-                }
-            ]
-        },
-        "metadata": {
-            "author": "Test User",
-            "created_for": "Testing"
-        }
-    }
+    out("\n=== Testing Team Creation ===")
 
-    response = requests.post(f"{BASE_URL}/api/teams", json=team_data)
-    print(f"Status: {response.status_code}")
-    print(f"Response: {json.dumps(response.json(), indent=2)}")
-    return response.json().get('id')
+    response = post_json(f"{BASE_URL}/api/teams", _TEAM_BODY)
+    return log_resp(response, out).get('id')
 
-def test_get_teams():
+def test_get_teams(out=print):
     """Test listing all teams"""
-    print("\n=== Testing Get All Teams ===")
+    out("\n=== Testing Get All Teams ===")
 
-    response = requests.get(f"{BASE_URL}/api/teams")
-    print(f"Status: {response.status_code}")
-    data = response.json()
-    print(f"Total teams: {data.get('total', 0)}")
+    response = SESSION.get(f"{BASE_URL}/api/teams")
+    out(f"Status: {response.status_code}")
+    data = json_loads(response.content)
+    out(f"Total teams: {data.get('total', 0)}")
     if data.get('teams'):
-        print(f"First team: {json.dumps(data['teams'][0], indent=2)}")
+        out(f"First team: {jdump(data['teams'][0])}")
 
-def test_get_team(team_id):
+def test_get_team(team_id, out=print):
     """Test getting a specific team"""
-    print(f"\n=== Testing Get Team {team_id} ===")
+    out(f"\n=== Testing Get Team {team_id} ===")
 
-    response = requests.get(f"{BASE_URL}/api/teams/{team_id}")
-    print(f"Status: {response.status_code}")
-    print(f"Response: {json.dumps(response.json(), indent=2)}")
+    response = SESSION.get(f"{BASE_URL}/api/teams/{team_id}")
+    log_resp(response, out)
 
-def test_rate_team(team_id):
+def test_rate_team(team_id, out=print):
     """Test rating a team"""
-    print(f"\n=== Testing Rate Team {team_id} ===")
+    out(f"\n=== Testing Rate Team {team_id} ===")
 
-    rating_data = {
-        "rating": 4,
-        "review": "Great team setup! Works well together."
-    }
+    response = post_json(f"{BASE_URL}/api/teams/{team_id}/rate", _RATING_TEAM_BODY)
+    log_resp(response, out)
 
-    response = requests.post(f"{BASE_URL}/api/teams/{team_id}/rate", json=rating_data)
-    print(f"Status: {response.status_code}")
-    print(f"Response: {json.dumps(response.json(), indent=2)}")
-
-def test_download_team(team_id):
+def test_download_team(team_id, out=print):
     """Test downloading a team"""
-    print(f"\n=== Testing Download Team {team_id} ===")
+    out(f"\n=== Testing Download Team {team_id} ===")
+
+    response = SESSION.get(f"{BASE_URL}/api/teams/{team_id}/download")
+    out(f"Status: {response.status_code}\nResponse keys: {list(json_loads(response.content).keys())}")
+
+def burst_rate(pool, kind, entity_id, body, n=20):
+    """Submit n concurrent ratings from this client and report the aggregate
+
+    Ratings are keyed per client (IP + User-Agent), and the burst keeps the
+    session's User-Agent, so every request updates the rating the earlier
+    rate test already left instead of adding new ones to the server.
+    """
+    print(f"\n=== Testing Concurrent Ratings ({n}x) for {kind[:-1].title()} {entity_id} ===")
 
-    response = requests.get(f"{BASE_URL}/api/teams/{team_id}/download")
-    print(f"Status: {response.status_code}")
-    print(f"Response keys: {list(response.json().keys())}")
+    url = f"{BASE_URL}/api/{kind}/{entity_id}/rate"
+    futures = [pool.submit(post_json, url, body) for _ in range(n)]
+    statuses = [future.result().status_code for future in futures]
+    data = json_loads(SESSION.get(f"{BASE_URL}/api/{kind}/{entity_id}").content)
+    print(f"Succeeded: {statuses.count(200)}/{n}\n"
+          f"Rating count: {data.get('rating_count')} (average {data.get('rating_average')})")
+
+def run_concurrently(pool, calls):
+    """Run independent (func, *args) tests on the pool, then print their output in order
+
+    Each test writes to its own buffer, so the output of tests running at the
+    same time never interleaves; the first failure is re-raised.
+    """
+    buffers = [io.StringIO() for _ in calls]
+    futures = [pool.submit(func, *args, out=functools.partial(print, file=buf))
+               for (func, *args), buf in zip(calls, buffers)]
+    for future, buf in zip(futures, buffers):
+        error = future.exception()
+        sys.stdout.write(buf.getvalue())
+        if error is not None:
+            raise error
 
 def run_all_tests():
     """Run all tests"""
@@ -153,30 +234,37 @@ def run_all_tests():
     print("=" * 60)
 
     try:
-        # Test agents
-        agent_id = test_create_agent()
-        if agent_id:
-            test_get_agents()
-            test_get_agent(agent_id)
-            test_rate_agent(agent_id)
-            test_download_agent(agent_id)
-
-            # Test teams
-            team_id = test_create_team(agent_id)
-            if team_id:
-                test_get_teams()
-                test_get_team(team_id)
-                test_rate_team(team_id)
-                test_download_team(team_id)
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            # Test agents
+            agent_id = test_create_agent()
+            if agent_id:
+                # The read/rate/download calls only depend on the created agent
+                run_concurrently(pool, [
+                    (test_get_agents,),
+                    (test_get_agent, agent_id),
+                    (test_rate_agent, agent_id),
+                    (test_download_agent, agent_id),
+                ])
+                burst_rate(pool, "agents", agent_id, _RATING_AGENT_BODY)
+
+                # Test teams
+                team_id = test_create_team(agent_id)
+                if team_id:
+                    run_concurrently(pool, [
+                        (test_get_teams,),
+                        (test_get_team, team_id),
+                        (test_rate_team, team_id),
+                        (test_download_team, team_id),
+                    ])
+                    burst_rate(pool, "teams", team_id, _RATING_TEAM_BODY)
 
         print("\n" + "=" * 60)
         print("All tests completed!")
         print("=" * 60)
 
     except Exception as e:
-        print(f"\nError during testing: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        log.exception("\nError during testing: %s", e)
 
 if __name__ == "__main__":
+    logging.basicConfig(format="%(message)s")
     run_all_tests()
@@ -1,14 +1,67 @@
 """
 Comprehensive test of Agents, Teams, and Ratings API using Flask test client
 """
-import json
+import os
 import sys
+from contextlib import contextmanager
+from flask.json.provider import DefaultJSONProvider
 from app import app
 
-# Set stdout encoding to UTF-8 for Windows compatibility
-if sys.platform == 'win32':
-    import codecs
-    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+# Pretty-print response bodies only when asked to
+VERBOSE = os.environ.get("TEST_VERBOSE") == "1"
+
+from utils import json_dumps, json_loads
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def jdump(obj):
+    """Format obj as JSON; indented only when TEST_VERBOSE=1."""
+    return json_dumps(obj, indent=VERBOSE).decode('utf-8')
+
+
+@contextmanager
+def orjson_provider():
+    """Serve the app's JSON through orjson (when installed) for the duration of the block."""
+    if orjson is None:
+        yield
+        return
+
+    class ORJSONProvider(DefaultJSONProvider):
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj, default=self.default,
+                                option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+    previous = app.json
+    app.json = ORJSONProvider(app)
+    try:
+        yield
+    finally:
+        app.json = previous
+
+
+def run_batch(calls):
+    """
+    Dispatch (method, path, body) calls in-process, in order.
+
+    Each call runs through Flask's full request dispatch (before/after
+    request hooks included) without going through the test client.
+    """
+    responses = []
+    for method, path, body in calls:
+        kwargs = {'method': method}
+        if body is not None:
+            kwargs['data'] = json_dumps(body)
+            kwargs['content_type'] = 'application/json'
+        with app.test_request_context(path, **kwargs):
+            responses.append(app.full_dispatch_request())
+    return responses
 
 def run_comprehensive_test():
     """Run comprehensive API tests"""
@@ -16,7 +69,12 @@ def run_comprehensive_test():
     print("COMPREHENSIVE API TEST - Agents, Teams, and Ratings")
     print("=" * 80)
 
-    with app.test_client() as client:
+    with orjson_provider(), app.test_client() as client:
+        # Warm up: compile the URL map and run one request so first-request
+        # setup cost doesn't land on Test 1
+        app.url_map.update()
+        client.get('/api/agents')
+
         # ====================================
         # Test 1: Create Agent
         # ====================================
@@ -37,76 +95,86 @@ def run_comprehensive_test():
         }
 
         response = client.post('/api/agents',
-                             data=json.dumps(agent_data),
+                             data=json_dumps(agent_data),
                              content_type='application/json')
 
         print(f"Status: {response.status_code}")
         if response.status_code == 201:
-            agent = response.get_json()
+            agent = json_loads(response.data)
             agent_id = agent['id']
             print(f"[OK] Agent created successfully with ID: {agent_id}")
         else:
-            print(f"✗ Failed to create agent: {response.get_json()}")
+            print(f"✗ Failed to create agent: {jdump(json_loads(response.data))}")
             return
 
+        # Tests 2-5, 11 and 12 only depend on the created agent, so they
+        # are dispatched together in one in-process batch
+        agent_rating_data = {
+            'rating': 5,
+            'review': 'Excellent agent! Very helpful for backend tasks.'
+        }
+        (all_agents_response, agent_response, agent_rate_response,
+         agent_download_response, search_response, sort_response) = run_batch([
+            ('GET', '/api/agents', None),
+            ('GET', f'/api/agents/{agent_id}', None),
+            ('POST', f'/api/agents/{agent_id}/rate', agent_rating_data),
+            ('GET', f'/api/agents/{agent_id}/download', None),
+            ('GET', '/api/agents?search=backend', None),
+            ('GET', '/api/agents?sort=downloads&order=desc', None),
+        ])
+
         # ====================================
         # Test 2: Get All Agents
         # ====================================
         print("\n[TEST 2] Getting all agents...")
-        response = client.get('/api/agents')
+        response = all_agents_response
         print(f"Status: {response.status_code}")
         if response.status_code == 200:
-            data = response.get_json()
+            data = json_loads(response.data)
             print(f"✓ Found {data['total']} agent(s)")
         else:
-            print(f"✗ Failed: {response.get_json()}")
+            print(f"✗ Failed: {jdump(json_loads(response.data))}")
 
         # ====================================
         # Test 3: Get Specific Agent
         # ====================================
         print(f"\n[TEST 3] Getting agent {agent_id}...")
-        response = client.get(f'/api/agents/{agent_id}')
+        response = agent_response
         print(f"Status: {response.status_code}")
         if response.status_code == 200:
-            agent = response.get_json()
+            agent = json_loads(response.data)
             print(f"✓ Retrieved agent: {agent['name']}")
             print(f"  - Tools: {agent['tools']}")
             print(f"  - Skills: {agent['skills']}")
         else:
-            print(f"✗ Failed: {response.get_json()}")
+            print(f"✗ Failed: {jdump(json_loads(response.data))}")
 
         # ====================================
         # Test 4: Rate Agent
         # ====================================
         print(f"\n[TEST 4] Rating agent {agent_id}...")
-        rating_data = {
-            'rating': 5,
-            'review': 'Excellent agent! Very helpful for backend tasks.'
-        }
-        response = client.post(f'/api/agents/{agent_id}/rate',
-                              data=json.dumps(rating_data),
-                              content_type='application/json')
+        response = agent_rate_response
         print(f"Status: {response.status_code}")
         if response.status_code == 200:
-            data = response.get_json()
+            data = json_loads(response.data)
             print(f"✓ Rating submitted successfully")
             print(f"  - Average: {data['rating_average']}")
             print(f"  - Count: {data['rating_count']}")
         else:
-            print(f"✗ Failed: {response.get_json()}")
+            print(f"✗ Failed: {jdump(json_loads(response.data))}")
 
         # ====================================
         # Test 5: Download Agent
         # ====================================
         print(f"\n[TEST 5] Downloading agent {agent_id}...")
-        response = client.get(f'/api/agents/{agent_id}/download')
+        response = agent_download_response
         print(f"Status: {response.status_code}")
         if response.status_code == 200:
-            agent = response.get_json()
+            agent = json_loads(response.data)
             print(f"✓ Agent downloaded successfully")
             print(f"  - Download count incremented")
         else:
-            print(f"✗ Failed: {response.get_json()}")
+            print(f"✗ Failed: {jdump(json_loads(response.data))}")
 
         # ====================================
         # Test 6: Create Team
@@ -142,102 +210,109 @@ def run_comprehensive_test():
         }
 
         response = client.post('/api/teams',
-                             data=json.dumps(team_data),
+                             data=json_dumps(team_data),
                              content_type='application/json')
 
         print(f"Status: {response.status_code}")
         if response.status_code == 201:
-            team = response.get_json()
+            team = json_loads(response.data)
             team_id = team['id']
             print(f"✓ Team created successfully with ID: {team_id}")
         else:
-            print(f"✗ Failed to create team: {response.get_json()}")
+            print(f"✗ Failed to create team: {jdump(json_loads(response.data))}")
             return
 
+        # Tests 7-10 only depend on the created team
+        team_rating_data = {
+            'rating': 4,
+            'review': 'Great team setup! Works well for full stack projects.'
+        }
+        (all_teams_response, team_response, team_rate_response,
+         team_download_response) = run_batch([
+            ('GET', '/api/teams', None),
+            ('GET', f'/api/teams/{team_id}', None),
+            ('POST', f'/api/teams/{team_id}/rate', team_rating_data),
+            ('GET', f'/api/teams/{team_id}/download', None),
+        ])
+
         # ====================================
         # Test 7: Get All Teams
         # ====================================
         print("\n[TEST 7] Getting all teams...")
-        response = client.get('/api/teams')
+        response = all_teams_response
         print(f"Status: {response.status_code}")
         if response.status_code == 200:
-            data = response.get_json()
+            data = json_loads(response.data)
             print(f"✓ Found {data['total']} team(s)")
         else:
-            print(f"✗ Failed: {response.get_json()}")
+            print(f"✗ Failed: {jdump(json_loads(response.data))}")
 
         # ====================================
         # Test 8: Get Specific Team
         # ====================================
         print(f"\n[TEST 8] Getting team {team_id}...")
-        response = client.get(f'/api/teams/{team_id}')
+        response = team_response
         print(f"Status: {response.status_code}")
         if response.status_code == 200:
-            team = response.get_json()
+            team = json_loads(response.data)
             print(f"✓ Retrieved team: {team['name']}")
             print(f"  - Agents: {len(team['agents'])} agent(s)")
             print(f"  - Workflow: {team['workflow']['type']}")
         else:
-            print(f"✗ Failed: {response.get_json()}")
+            print(f"✗ Failed: {jdump(json_loads(response.data))}")
 
         # ====================================
         # Test 9: Rate Team
         # ====================================
         print(f"\n[TEST 9] Rating team {team_id}...")
-        rating_data = {
-            'rating': 4,
-            'review': 'Great team setup! Works well for full stack projects.'
-        }
-        response = client.post(f'/api/teams/{team_id}/rate',
-                              data=json.dumps(rating_data),
-                              content_type='application/json')
+        response = team_rate_response
         print(f"Status: {response.status_code}")
         if response.status_code == 200:
-            data = response.get_json()
+            data = json_loads(response.data)
             print(f"✓ Rating submitted successfully")
             print(f"  - Average: {data['rating_average']}")
             print(f"  - Count: {data['rating_count']}")
         else:
-            print(f"✗ Failed: {response.get_json()}")
+            print(f"✗ Failed: {jdump(json_loads(response.data))}")
 
         # ====================================
         # Test 10: Download Team
         # ====================================
         print(f"\n[TEST 10] Downloading team {team_id}...")
-        response = client.get(f'/api/teams/{team_id}/download')
+        response = team_download_response
         print(f"Status: {response.status_code}")
         if response.status_code == 200:
-            team = response.get_json()
+            team = json_loads(response.data)
             print(f"✓ Team downloaded successfully")
             print(f"  - Download count incremented")
         else:
-            print(f"✗ Failed: {response.get_json()}")
+            print(f"✗ Failed: {jdump(json_loads(response.data))}")
 
         # ====================================
         # Test 11: Search Agents
         # ====================================
         print("\n[TEST 11] Searching agents...")
-        response = client.get('/api/agents?search=backend')
+        response = search_response
         print(f"Status: {response.status_code}")
         if response.status_code == 200:
-            data = response.get_json()
+            data = json_loads(response.data)
             print(f"✓ Found {data['total']} agent(s) matching 'backend'")
         else:
-            print(f"✗ Failed: {response.get_json()}")
+            print(f"✗ Failed: {jdump(json_loads(response.data))}")
 
         # ====================================
         # Test 12: Sort Agents by Downloads
         # ====================================
         print("\n[TEST 12] Sorting agents by downloads...")
-        response = client.get('/api/agents?sort=downloads&order=desc')
+        response = sort_response
         print(f"Status: {response.status_code}")
         if response.status_code == 200:
-            data = response.get_json()
+            data = json_loads(response.data)
             print(f"✓ Retrieved {data['total']} agent(s) sorted by downloads")
             if data['agents']:
                 print(f"  - Top agent: {data['agents'][0]['name']} ({data['agents'][0]['download_count']} downloads)")
         else:
-            print(f"✗ Failed: {response.get_json()}")
+            print(f"✗ Failed: {jdump(json_loads(response.data))}")
 
         # ====================================
         # Summary
@@ -254,4 +329,7 @@ def run_comprehensive_test():
         print("=" * 80)
 
 if __name__ == "__main__":
+    # Set stdout encoding to UTF-8 for Windows compatibility
+    if sys.platform == 'win32':
+        sys.stdout.reconfigure(encoding='utf-8', errors='strict')
     run_comprehensive_test()
@@ -1,8 +1,37 @@
 #!/usr/bin/env python
-"""Test script to diagnose Flask app loading issues"""
+"""
+Test script to diagnose Flask app loading issues
 
+Set QUICK=1 to run only the import and route checks (Tests 1, 4 and 6).
+"""
+
+import importlib.util
+import itertools
+import logging
+import os
+import py_compile
 import sys
-import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+log = logging.getLogger(__name__)
+
+# Configure root logging only when run as a script, so importing this module
+# (e.g. pytest collecting it) leaves the caller's logging setup alone
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+# Skip Tests 2, 3, 5, 7 and 8 when only the app import needs checking
+QUICK = os.environ.get("QUICK") == "1"
+
+
+def pyc_is_fresh(filename):
+    """True if the cached bytecode is at least as new as the source (already compiled)"""
+    try:
+        pyc_mtime = os.stat(importlib.util.cache_from_source(filename)).st_mtime
+    except OSError:
+        return False
+    return pyc_mtime >= os.stat(filename).st_mtime
+
 
 print("=" * 60)
 print("FLASK APP LOADING DIAGNOSTICS")
@@ -17,28 +46,31 @@ try:
     print(f"    - POSTGRES_AVAILABLE: {db.POSTGRES_AVAILABLE}")
     print(f"    - DB_FILE: {db.DB_FILE}")
 except Exception as e:
-    print(f"    [FAILED] {e}")
-    traceback.print_exc()
+    log.exception("    [FAILED] %s", e)
     sys.exit(1)
 
 # Test 2: Test connection pooling function
 print("\n[2] Testing connection pooling function...")
-try:
-    pool_func = db.get_postgres_pool
-    print("    [OK] get_postgres_pool function exists")
-except Exception as e:
-    print(f"    [FAILED] {e}")
-    traceback.print_exc()
+if QUICK:
+    print("    [SKIPPED] QUICK=1")
+else:
+    try:
+        pool_func = db.get_postgres_pool
+        print("    [OK] get_postgres_pool function exists")
+    except Exception as e:
+        log.exception("    [FAILED] %s", e)
 
 # Test 3: Test database context manager
 print("\n[3] Testing database context manager...")
-try:
-    with db.get_db() as conn:
-        print("    [OK] Database context manager works")
-        print(f"    - Connection type: {type(conn)}")
-except Exception as e:
-    print(f"    [FAILED] {e}")
-    traceback.print_exc()
+if QUICK:
+    print("    [SKIPPED] QUICK=1")
+else:
+    try:
+        with db.get_db() as conn:
+            print("    [OK] Database context manager works")
+            print(f"    - Connection type: {type(conn)}")
+    except Exception as e:
+        log.exception("    [FAILED] %s", e)
 
 # Test 4: Import Flask app
 print("\n[4] Testing Flask app import...")
@@ -48,57 +80,72 @@ try:
     print(f"    - App type: {type(app)}")
     print(f"    - App name: {app.name}")
 except Exception as e:
-    print(f"    [FAILED] {e}")
-    traceback.print_exc()
+    log.exception("    [FAILED] %s", e)
     sys.exit(1)
 
 # Test 5: Check WSGI handler
 print("\n[5] Testing WSGI handler...")
-try:
-    import app as app_module
-    print("    [OK] app module imported")
-    print(f"    - Module has 'app' attribute: {hasattr(app_module, 'app')}")
-    print(f"    - app_module.app type: {type(app_module.app)}")
-    print(f"    - app_module.app is Flask app: {app_module.app is app}")
-except Exception as e:
-    print(f"    [FAILED] {e}")
-    traceback.print_exc()
+if QUICK:
+    print("    [SKIPPED] QUICK=1")
+else:
+    try:
+        import app as app_module
+        print("    [OK] app module imported")
+        print(f"    - Module has 'app' attribute: {hasattr(app_module, 'app')}")
+        print(f"    - app_module.app type: {type(app_module.app)}")
+        print(f"    - app_module.app is Flask app: {app_module.app is app}")
+    except Exception as e:
+        log.exception("    [FAILED] %s", e)
 
 # Test 6: Check app routes
 print("\n[6] Testing app routes...")
 try:
-    routes = list(app.url_map.iter_rules())
-    print(f"    [OK] App has {len(routes)} routes")
-    for rule in routes[:5]:  # Show first 5 routes
-        print(f"    - {rule.rule} -> {rule.endpoint}")
-    if len(routes) > 5:
-        print(f"    ... and {len(routes) - 5} more routes")
+    rules = app.url_map.iter_rules()
+    first_routes = list(itertools.islice(rules, 5))  # Show first 5 routes
+    remaining = sum(1 for _ in rules)
+    print(f"    [OK] App has {len(first_routes) + remaining} routes")
+    sys.stdout.write("".join(f"    - {rule.rule} -> {rule.endpoint}\n" for rule in first_routes))
+    if remaining:
+        print(f"    ... and {remaining} more routes")
 except Exception as e:
-    print(f"    [FAILED] {e}")
-    traceback.print_exc()
+    log.exception("    [FAILED] %s", e)
 
 # Test 7: Check for syntax errors in modified files
 print("\n[7] Checking for syntax errors in modified files...")
-files_to_check = ['app.py', 'database.py']
-for filename in files_to_check:
-    try:
-        with open(filename, 'r') as f:
-            compile(f.read(), filename, 'exec')
-        print(f"    [OK] {filename} - no syntax errors")
-    except SyntaxError as e:
-        print(f"    [FAILED] {filename} - SYNTAX ERROR at line {e.lineno}: {e.msg}")
+if QUICK:
+    print("    [SKIPPED] QUICK=1")
+else:
+    files_to_check = ['app.py', 'database.py']
+
+    stale_files = [f for f in files_to_check if not pyc_is_fresh(f)]
+    for filename in files_to_check:
+        if filename not in stale_files:
+            print(f"    [OK] {filename} - no syntax errors (bytecode cache up to date)")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        futures = {pool.submit(py_compile.compile, f, doraise=True): f for f in stale_files}
+        for future in as_completed(futures):
+            filename = futures[future]
+            try:
+                future.result()
+                print(f"    [OK] {filename} - no syntax errors")
+            except py_compile.PyCompileError as e:
+                err = e.exc_value
+                print(f"    [FAILED] {filename} - SYNTAX ERROR at line {getattr(err, 'lineno', '?')}: {getattr(err, 'msg', e.msg)}")
 
 # Test 8: Test migration conversion
 print("\n[8] Testing migration conversion...")
-try:
-    test_sql = "CREATE TABLE test (id INTEGER PRIMARY KEY AUTOINCREMENT, active INTEGER DEFAULT 0);"
-    converted = db.convert_schema_for_postgres(test_sql)
-    print("    [OK] Schema conversion works")
-    print(f"    - Original: {test_sql}")
-    print(f"    - Converted: {converted}")
-except Exception as e:
-    print(f"    [FAILED] {e}")
-    traceback.print_exc()
+if QUICK:
+    print("    [SKIPPED] QUICK=1")
+else:
+    try:
+        test_sql = "CREATE TABLE test (id INTEGER PRIMARY KEY AUTOINCREMENT, active INTEGER DEFAULT 0);"
+        converted = db.convert_schema_for_postgres(test_sql)
+        print("    [OK] Schema conversion works")
+        print(f"    - Original: {test_sql}")
+        print(f"    - Converted: {converted}")
+    except Exception as e:
+        log.exception("    [FAILED] %s", e)
 
 print("\n" + "=" * 60)
 print("DIAGNOSTICS COMPLETE")
@@ -0,0 +1,224 @@
+"""
+Unit tests for AgentIR, the format parsers/serializers and UniversalConverter validation.
+
+These exercise the objects directly, without the Flask app.
+"""
+
+import functools
+import io
+import json
+
+import pytest
+
+# The converters/parsers/serializers packages are imported inside the tests so
+# collecting (or -k selecting) this module doesn't pay for them up front
+
+
+@functools.lru_cache(maxsize=None)
+def _parsers():
+    """Return the shared (Claude, Roo) parsers; they are stateless"""
+    from parsers import ClaudeParser, RooParser
+    return ClaudeParser(), RooParser()
+
+
+@functools.lru_cache(maxsize=None)
+def _serializers():
+    """Return the shared (Claude, Roo, Custom) serializers; they are stateless"""
+    from serializers import ClaudeSerializer, RooSerializer, CustomSerializer
+    return ClaudeSerializer(), RooSerializer(), CustomSerializer()
+
+
+# Minimal valid agent for the serializer tests; the tests must not mutate it
+_TEST_IR_PAYLOAD = {
+    'name': 'Test Agent',
+    'description': 'Test description',
+    'capabilities': ['test-cap'],
+    'tools': ['test-tool'],
+    'system_prompt': 'Test prompt'
+}
+
+
+def test_agent_ir():
+    """Test AgentIR class."""
+    from converters import AgentIR
+    
+    # Create AgentIR from dict
+    ir = AgentIR.from_dict({
+        'name': 'Test Agent',
+        'description': 'Test description',
+        'capabilities': ['cap1', 'cap2'],
+        'tools': ['tool1', 'tool2'],
+        'system_prompt': 'Test prompt',
+        'category': 'Testing',
+        'version': '2.0.0'
+    })
+    
+    # Validate
+    is_valid, errors = ir.validate()
+    assert is_valid
+    
+    # Convert to dict
+    ir_dict = ir.to_dict()
+    assert ir_dict['name'] == 'Test Agent'
+    assert ir_dict['capabilities'] == ['cap1', 'cap2']
+    
+    # Test merge methods
+    ir.merge_capabilities(['cap3'])
+    assert 'cap3' in ir.capabilities
+    
+    ir.merge_tools(['tool3'])
+    assert 'tool3' in ir.tools
+    
+    ir.add_tag('test-tag')
+    assert 'test-tag' in ir.tags
+    
+    ir.set_metadata('test-key', 'test-value')
+    assert ir.get_metadata('test-key') == 'test-value'
+
+
+def test_parser_validation():
+    """Test parser validation."""
+    
+    claude_parser, roo_parser = _parsers()
+    
+    # Test Claude parser validation
+    
+    # Valid data
+    valid_data = {
+        'name': 'Test',
+        'description': 'Test description',
+        'system_prompt': 'Test prompt'
+    }
+    is_valid, errors = claude_parser.validate(valid_data)
+    assert is_valid
+    
+    # Invalid data (missing required fields)
+    invalid_data = {'name': 'Test'}
+    is_valid, errors = claude_parser.validate(invalid_data)
+    assert not is_valid
+    assert any('description' in error for error in errors)
+    
+    # Test Roo parser validation
+    # Valid data
+    valid_roo = {
+        'mode': 'test-mode',
+        'name': 'Test',
+        'description': 'Test description',
+        'system_prompt': 'Test prompt'
+    }
+    is_valid, errors = roo_parser.validate(valid_roo)
+    assert is_valid
+    
+    # Invalid data (missing mode and name)
+    invalid_roo = {'description': 'Test description'}
+    is_valid, errors = roo_parser.validate(invalid_roo)
+    assert not is_valid
+    assert len(errors) > 0
+    
+    # Batch parsing accepts both JSON bytes and YAML strings
+    irs = roo_parser.parse_many([
+        json.dumps(valid_roo).encode('utf-8'),
+        "mode: yaml-mode\ndescription: Test description\ntools: [file-read]\n"
+    ])
+    assert [ir.name for ir in irs] == ['Test', 'Yaml Mode']
+
+
+def test_serializer_methods():
+    """Test serializer methods."""
+    from converters import AgentIR
+    claude_serializer, roo_serializer, custom_serializer = _serializers()
+    
+    # Create test IR
+    ir = AgentIR.from_dict(_TEST_IR_PAYLOAD)
+    
+    # Test Claude serializer
+    claude_data = claude_serializer.serialize(ir)
+    assert claude_data['name'] == 'Test Agent'
+    assert claude_data['description'] == 'Test description'
+    
+    # Test Roo serializer
+    roo_data = roo_serializer.serialize(ir)
+    assert roo_data['name'] == 'Test Agent'
+    assert 'mode' in roo_data
+    assert roo_data['mode'] == 'test-agent'
+    
+    # Test Custom serializer
+    custom_data = custom_serializer.serialize(ir)
+    assert custom_data['name'] == 'Test Agent'
+    assert 'capabilities' in custom_data
+    assert 'tools' in custom_data
+
+    # Test skipping validation for already-validated IRs
+    invalid_ir = AgentIR()
+    invalid_ir.name = 'Unchecked Agent'
+    with pytest.raises(ValueError):
+        claude_serializer.serialize(invalid_ir)
+    unchecked_data = claude_serializer.serialize(invalid_ir, validate=False)
+    assert unchecked_data['name'] == 'Unchecked Agent'
+
+    # Test streaming JSON export
+    stream = io.BytesIO()
+    count = roo_serializer.to_json_many([ir, ir], stream)
+    lines = stream.getvalue().splitlines()
+    assert count == 2 and len(lines) == 2
+    assert json.loads(lines[0]) == roo_data
+
+
+@pytest.mark.parametrize("use_orjson", [True, False], ids=["orjson", "stdlib"])
+def test_serializer_json_stream(monkeypatch, use_orjson):
+    """to_json_stream writes the same UTF-8 bytes as to_json, with or without orjson."""
+    import utils
+    from converters import AgentIR
+    if use_orjson and utils.orjson is None:
+        pytest.skip("orjson is not installed")
+    if not use_orjson:
+        monkeypatch.setattr(utils, 'orjson', None)
+    claude_serializer = _serializers()[0]
+    
+    ir = AgentIR.from_dict(dict(_TEST_IR_PAYLOAD, description='Résumé helper ✓'))
+    stream = io.BytesIO()
+    claude_serializer.to_json_stream(ir, stream)
+    
+    written = stream.getvalue()
+    assert written == claude_serializer.to_json(ir).encode('utf-8')
+    assert 'Résumé helper ✓'.encode('utf-8') in written
+    assert json.loads(written) == claude_serializer.serialize(ir)
+
+
+def test_json_helpers_paths_match(monkeypatch):
+    """The orjson and stdlib paths of utils.json_dumps/json_loads agree."""
+    import utils
+    from converters import AgentIR
+    if utils.orjson is None:
+        pytest.skip("orjson is not installed")
+    ir = AgentIR.from_dict(dict(_TEST_IR_PAYLOAD, description='Résumé helper ✓'))
+    data = _serializers()[1].serialize(ir)
+    
+    with_orjson = (utils.json_dumps(data), utils.json_dumps(data, indent=True))
+    monkeypatch.setattr(utils, 'orjson', None)
+    assert (utils.json_dumps(data), utils.json_dumps(data, indent=True)) == with_orjson
+    assert utils.json_loads(with_orjson[0]) == data
+
+
+def test_universal_converter_validation():
+    """Test UniversalConverter validation."""
+    from converters import UniversalConverter
+    
+    # Test valid conversion
+    is_valid, errors = UniversalConverter.validate_conversion('claude', 'roo')
+    assert is_valid
+    
+    # Test invalid conversion
+    is_valid, errors = UniversalConverter.validate_conversion('invalid', 'roo')
+    assert not is_valid
+    assert 'invalid' in str(errors)
+    
+    # Test same format conversion
+    is_valid, errors = UniversalConverter.validate_conversion('claude', 'claude')
+    assert not is_valid
+    
+    # Test supported formats
+    formats = UniversalConverter.get_supported_formats()
+    assert 'claude' in formats
+    assert 'roo' in formats
+    assert 'custom' in formats
@@ -0,0 +1,129 @@
+"""
+Unit tests for the helpers in utils.
+
+These exercise the functions directly, without the Flask app.
+"""
+
+import pytest
+
+import utils
+
+
+@pytest.mark.parametrize("size_bytes, expected", [
+    (0, "0.0 B"),
+    (1023, "1023.0 B"),
+    (1024, "1.0 KB"),
+    (1024 ** 2 - 1, "1024.0 KB"),
+    (1024 ** 2, "1.0 MB"),
+    (1024 ** 4, "1.0 TB"),
+    (1024 ** 5, "1024.0 TB"),
+])
+def test_file_size_unit_boundaries(size_bytes, expected):
+    """Sizes switch unit exactly at each power of 1024 and stop at TB."""
+    assert utils.get_file_size_human_readable(size_bytes) == expected
+
+
+@pytest.mark.parametrize("name, content", [
+    ("agent.yaml", "name: YAML Agent\ntools:\n  - Read\n"),
+    ("agent.json", '{"name": "JSON Agent", "tools": ["Read"]}\n'),
+    ("notes.txt", "Plain text notes ✓\nsecond line\n"),
+])
+def test_read_file_content(tmp_path, name, content):
+    """UTF-8 files read back unchanged, whatever their format."""
+    path = tmp_path / name
+    path.write_bytes(content.encode('utf-8'))
+    assert utils.read_file_content(str(path)) == content
+
+
+def test_read_file_content_normalizes_newlines_and_falls_back(tmp_path):
+    """Line endings are translated like a text-mode read; non-UTF-8 bytes fall back to latin-1."""
+    path = tmp_path / "agent.yaml"
+    path.write_bytes(b"name: Caf\xe9\r\ntools: []\r")
+    assert utils.read_file_content(str(path)) == "name: Café\ntools: []\n"
+
+
+@pytest.mark.parametrize("filename, expected", [
+    ("../../etc/passwd", "_.._etc_passwd"),
+    ("..\\windows\\system32", "_windows_system32"),
+    ("agent\x00.json", "agent.json"),
+    ("  .hidden.yaml. ", "hidden.yaml"),
+    ("...", ""),
+    ("", ""),
+    ("agénte ✓.md", "agénte ✓.md"),
+])
+def test_sanitize_filename(filename, expected):
+    """Separators become underscores, nulls vanish, edge dots/spaces are stripped, unicode is kept."""
+    assert utils.sanitize_filename(filename) == expected
+
+
+def test_sanitize_filename_truncates_keeping_extension():
+    """Names over 255 characters are cut down without losing their extension."""
+    sanitized = utils.sanitize_filename("a" * 300 + ".yaml")
+    assert len(sanitized) == 255 and sanitized.endswith(".yaml")
+
+
+@pytest.mark.parametrize("value, expected", [
+    ('["Read", "Write"]', ["Read", "Write"]),
+    ("read, write", ["read", "write"]),
+    ('  ["Read"]', ["Read"]),
+    ("[read, write", ["[read", "write"]),
+])
+def test_normalize_agent_data_string_lists(value, expected):
+    """String list fields parse as JSON when they look like it and split on commas otherwise."""
+    normalized = utils.normalize_agent_data({'tools': value, 'tags': value})
+    assert normalized['tools'] == expected
+    assert normalized['tags'] == expected
+    assert normalized['capabilities'] == []
+
+
+def test_extract_metadata():
+    """Known metadata fields are copied, unknown ones dropped, and agent fields always set."""
+    data = {'name': 'Agent', 'version': '1.0', 'tools': ['Read'], 'unrelated': True}
+    metadata = utils.extract_metadata(data)
+    assert metadata == {
+        'name': 'Agent',
+        'version': '1.0',
+        'capabilities': [],
+        'tools': ['Read'],
+        'system_prompt': None,
+        'config_schema': None,
+    }
+    
+    # List defaults are fresh copies, never shared between results
+    first, second = utils.extract_metadata({}), utils.extract_metadata({})
+    first['capabilities'].append('search')
+    assert second['capabilities'] == []
+
+
+@pytest.mark.parametrize("use_orjson", [True, False], ids=["orjson", "stdlib"])
+def test_validate_json(monkeypatch, use_orjson):
+    """JSON objects validate from str or bytes; anything else reports why it failed."""
+    if use_orjson and utils.orjson is None:
+        pytest.skip("orjson is not installed")
+    if not use_orjson:
+        monkeypatch.setattr(utils, 'orjson', None)
+    
+    assert utils.validate_json('{"name": "Agent"}') == (True, {'name': 'Agent'}, None)
+    assert utils.validate_json('{"name": "Agént"}'.encode('utf-8')) == (True, {'name': 'Agént'}, None)
+    
+    assert utils.validate_json('["Agent"]') == (False, None, "JSON must be an object/dictionary")
+    for invalid in ('{ invalid json }', '', b'{"name": "\xff"}'):
+        is_valid, data, error = utils.validate_json(invalid)
+        assert not is_valid and data is None and error.startswith("Invalid JSON:")
+
+
+def test_validate_yaml():
+    """YAML mappings validate; other documents and malformed YAML report why they failed."""
+    pytest.importorskip("yaml")
+    
+    assert utils.validate_yaml("name: Agent\ntools:\n  - Read\n") == (
+        True, {'name': 'Agent', 'tools': ['Read']}, None)
+    
+    assert utils.validate_yaml("- Read\n- Write\n") == (False, None, "YAML must be a dictionary/object")
+    assert utils.validate_yaml("") == (False, None, "YAML must be a dictionary/object")
+    is_valid, data, error = utils.validate_yaml("name: [unclosed\n")
+    assert not is_valid and data is None and error.startswith("Invalid YAML:")
+
+    # PyYAML and its safe loader are resolved once and shared with the parsers
+    assert utils._yaml_loader() is utils._yaml_loader()
+    assert utils.yaml_safe_load("tools: [Read]") == {'tools': ['Read']}
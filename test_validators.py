@@ -8,16 +8,17 @@ This script verifies that:
 2. Validation catches invalid configs
 3. Validation passes valid configs
 4. Error messages are helpful
+
+Pass -v to print the traceback of any test that crashes.
 """
 
 import sys
 import json
-import io
 
 # Fix Windows console encoding issues
 if sys.platform == 'win32':
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+    sys.stderr.reconfigure(encoding='utf-8', errors='replace')
 
 
 def test_imports():
@@ -30,11 +31,18 @@ def test_imports():
             VALID_TOOLS, VALID_MODELS, VALID_WORKFLOW_TYPES
         )
         print("✓ All imports successful")
-        return True
     except ImportError as e:
         print(f"✗ Import failed: {e}")
         return False
 
+    # Valid-value constants are frozensets for hashed membership checks
+    for constant in (VALID_TOOLS, VALID_MODELS, VALID_WORKFLOW_TYPES):
+        if not isinstance(constant, frozenset):
+            print(f"✗ Expected a frozenset, got {type(constant).__name__}")
+            return False
+    print("✓ Valid-value constants are frozensets")
+    return True
+
 
 def test_agent_validation():
     """Test agent validation"""
@@ -42,62 +50,90 @@ def test_agent_validation():
 
     from validators import validate_agent, AgentValidationError, validate_agent_strict
 
-    # Test valid agent
-    valid_agent = {
-        'slug': 'code-analyzer',
-        'name': 'Code Analyzer',
-        'instructions': 'You are a code analyzer that helps developers understand code structure and identify patterns. Your role is to analyze code and provide insights.',
-        'tools': ['Read', 'Grep', 'Glob']
-    }
-
-    is_valid, errors = validate_agent(valid_agent)
-    if is_valid:
-        print("✓ Valid agent passed validation")
-    else:
-        print(f"✗ Valid agent failed: {errors}")
-        return False
-
-    # Test invalid agent - missing required fields
-    invalid_agent_1 = {
-        'slug': 'test'
-    }
-
-    is_valid, errors = validate_agent(invalid_agent_1)
-    if not is_valid and len(errors) > 0:
-        print(f"✓ Invalid agent (missing fields) correctly caught: {len(errors)} errors")
-    else:
-        print("✗ Invalid agent should have failed validation")
-        return False
-
-    # Test invalid agent - bad slug
-    invalid_agent_2 = {
-        'slug': 'Bad_Slug!',
-        'name': 'Test',
-        'instructions': 'Short instructions should fail minimum length validation here now',
-        'tools': ['Read']
-    }
-
-    is_valid, errors = validate_agent(invalid_agent_2)
-    if not is_valid:
-        print(f"✓ Invalid agent (bad slug) correctly caught: {errors[0]}")
-    else:
-        print("✗ Invalid slug should have failed validation")
-        return False
-
-    # Test invalid agent - invalid tool
-    invalid_agent_3 = {
-        'slug': 'test-agent',
-        'name': 'Test Agent',
-        'instructions': 'This is a test agent with invalid tools that should fail validation',
-        'tools': ['Read', 'InvalidTool']
-    }
+    # (label, config, expected validity, text one of the errors must contain)
+    cases = [
+        ('Valid agent', {
+            'slug': 'code-analyzer',
+            'name': 'Code Analyzer',
+            'instructions': 'You are a code analyzer that helps developers understand code structure and identify patterns. Your role is to analyze code and provide insights.',
+            'tools': ['Read', 'Grep', 'Glob']
+        }, True, None),
+        ('Invalid agent (missing fields)', {
+            'slug': 'test'
+        }, False, 'Missing required field'),
+        ('Invalid agent (bad slug)', {
+            'slug': 'Bad_Slug!',
+            'name': 'Test',
+            'instructions': 'Short instructions should fail minimum length validation here now',
+            'tools': ['Read']
+        }, False, 'Slug'),
+        ('Invalid agent (trailing newline in slug)', {
+            'slug': 'test-agent\n',
+            'name': 'Test',
+            'instructions': 'Slugs ending in a newline must not slip past the end-of-string anchor',
+            'tools': ['Read']
+        }, False, 'Slug'),
+        ('Invalid agent (bad tool)', {
+            'slug': 'test-agent',
+            'name': 'Test Agent',
+            'instructions': 'This is a test agent with invalid tools that should fail validation',
+            'tools': ['Read', 'InvalidTool']
+        }, False, 'InvalidTool'),
+        ('Invalid agent (object and array tools)', {
+            'slug': 'test-agent',
+            'name': 'Test Agent',
+            'instructions': 'Tools given as JSON objects or arrays must be reported, not crash the check',
+            'tools': ['Read', {'name': 'Write'}, ['Edit']]
+        }, False, "Invalid tool: '{'name': 'Write'}'"),
+        ('Invalid agent (array model)', {
+            'slug': 'test-agent',
+            'name': 'Test Agent',
+            'instructions': 'A default_model given as a JSON array must be reported as an invalid model',
+            'tools': ['Read'],
+            'default_model': ['sonnet']
+        }, False, 'Invalid model'),
+        ('Invalid agent (object model)', {
+            'slug': 'test-agent',
+            'name': 'Test Agent',
+            'instructions': 'A default_model given as a JSON object must be reported as an invalid model',
+            'tools': ['Read'],
+            'default_model': {'name': 'sonnet'}
+        }, False, 'Invalid model'),
+    ]
 
-    is_valid, errors = validate_agent(invalid_agent_3)
-    if not is_valid and any('InvalidTool' in e for e in errors):
-        print("✓ Invalid agent (bad tool) correctly caught")
-    else:
-        print("✗ Invalid tool should have failed validation")
+    for label, config, expect_valid, needle in cases:
+        is_valid, errors = validate_agent(config)
+        if is_valid != expect_valid or (needle and not any(needle in e for e in errors)):
+            print(f"✗ {label}: expected valid={expect_valid}, got errors: {errors}")
+            return False
+        print(f"✓ {label} {'passed' if expect_valid else 'correctly caught'}")
+
+    # Test batch validation: small batches run serially, large ones (200+)
+    # go through the pool, which is swapped for threads so no worker
+    # processes are spawned here
+    from unittest import mock
+    from concurrent.futures import ThreadPoolExecutor
+    from validators import agent_validator, validate_agents_batch
+    case_configs = [config for _, config, _, _ in cases]
+    with mock.patch.object(agent_validator, 'ProcessPoolExecutor', wraps=ThreadPoolExecutor) as pool:
+        for repeat, pooled in ((1, False), (50, True)):
+            configs = case_configs * repeat
+            pool.reset_mock()
+            if validate_agents_batch(configs) != [validate_agent(config) for config in configs]:
+                print(f"✗ Batch validation of {len(configs)} agents differs from serial validation")
+                return False
+            if pool.called != pooled:
+                print(f"✗ Batch validation of {len(configs)} agents took the wrong path")
+                return False
+            print(f"✓ Batch validation of {len(configs)} agents matches serial validation "
+                  f"({'pool' if pooled else 'serial'})")
+
+    # Test fail-fast validation
+    is_valid, errors = validate_agent({'slug': 'test'}, fail_fast=True)
+    if is_valid or len(errors) != 1:
+        print(f"✗ Fail-fast validation should stop at one error, got: {errors}")
         return False
+    print("✓ Fail-fast validation stopped at the first error")
 
     # Test strict validation
     try:
@@ -117,8 +153,7 @@ def test_team_validation():
     from validators import validate_team, TeamValidationError, validate_team_strict
 
     # Mock agent exists function
-    def agent_exists(slug):
-        return slug in ['agent-1', 'agent-2', 'agent-3']
+    agent_exists = frozenset({'agent-1', 'agent-2', 'agent-3'}).__contains__
 
     # Test valid team
     valid_team = {
@@ -206,6 +241,61 @@ def test_team_validation():
         print("✗ Invalid workflow type should have failed validation")
         return False
 
+    # Test agent and stage references given as objects instead of slugs
+    object_refs_team = {
+        'slug': 'object-team',
+        'name': 'Object Team',
+        'agents': [
+            {'slug': 'agent-1', 'role': 'developer'},
+            {'slug': {'slug': 'agent-2'}, 'role': 'reviewer'},
+            {'slug': ['agent-3'], 'role': 'tester'}
+        ],
+        'workflow': {
+            'type': 'sequential',
+            'stages': [{'name': 'build', 'agents': ['agent-1', {'slug': 'agent-1'}]}]
+        }
+    }
+    is_valid, errors = validate_team(object_refs_team, agent_exists)
+    if (is_valid
+            or sum('invalid slug format' in e for e in errors) != 2
+            or not any('references unknown agent' in e for e in errors)):
+        print(f"✗ Object agent/stage references should have failed validation, got: {errors}")
+        return False
+    print("✓ Invalid team (object agent/stage references) correctly caught")
+
+    # Test workflow types given as arrays/objects
+    for workflow_type in (['sequential'], {'type': 'sequential'}):
+        invalid_team_5 = dict(invalid_team_4, workflow={'type': workflow_type})
+        is_valid, errors = validate_team(invalid_team_5, agent_exists)
+        if is_valid or not any('workflow type' in e.lower() for e in errors):
+            print(f"✗ Workflow type {workflow_type!r} should have failed validation")
+            return False
+    print("✓ Invalid team (array/object workflow type) correctly caught")
+
+    # Test batch validation: small batches run serially in this thread,
+    # large ones (200+) go through the thread pool
+    import threading
+    from validators import validate_teams_batch
+    calling_threads = set()
+
+    def tracking_exists(slug):
+        calling_threads.add(threading.get_ident())
+        return agent_exists(slug)
+
+    team_cases = [valid_team, invalid_team_1, invalid_team_2, invalid_team_3, invalid_team_4]
+    for repeat, pooled in ((1, False), (50, True)):
+        configs = team_cases * repeat
+        calling_threads.clear()
+        results = validate_teams_batch(configs, tracking_exists)
+        if results != [validate_team(config, agent_exists) for config in configs]:
+            print(f"✗ Batch validation of {len(configs)} teams differs from serial validation")
+            return False
+        if (threading.get_ident() not in calling_threads) != pooled:
+            print(f"✗ Batch validation of {len(configs)} teams ran on the wrong threads")
+            return False
+        print(f"✓ Batch validation of {len(configs)} teams matches serial validation "
+              f"({'thread pool' if pooled else 'serial'})")
+
     # Test strict validation
     try:
         validate_team_strict({'slug': 'test'})
@@ -221,7 +311,7 @@ def test_json_validation():
     """Test JSON string validation"""
     print("\nTesting JSON validation...")
 
-    from validators import validate_agent_json, validate_team_json
+    from validators import validate_agent_json, validate_agent_bytes, validate_team_json
 
     # Test valid agent JSON
     valid_json = json.dumps({
@@ -248,6 +338,30 @@ def test_json_validation():
         print("✗ Invalid JSON should have failed validation")
         return False
 
+    # Test oversized payloads are rejected before parsing
+    from validators import MAX_JSON_BYTES
+    is_valid, errors = validate_agent_json(' ' * (MAX_JSON_BYTES + 1))
+    if is_valid or not any('exceeds' in e for e in errors):
+        print(f"✗ Oversized payload should have been rejected, got: {errors}")
+        return False
+    print("✓ Oversized payload rejected before parsing")
+
+    # Test raw bytes, including bytes that aren't valid UTF-8
+    is_valid, errors = validate_agent_bytes(valid_json.encode('utf-8'))
+    if not is_valid:
+        print(f"✗ Valid agent JSON bytes failed: {errors}")
+        return False
+    is_valid, errors = validate_agent_bytes(b'{"slug": "\xff"}')
+    if is_valid or not any('Invalid JSON' in e for e in errors):
+        print("✗ Invalid UTF-8 bytes should have failed validation")
+        return False
+    print("✓ Agent JSON bytes validated without decoding")
+    is_valid, errors = validate_team_json(b'{"slug": "\xff"}')
+    if is_valid or not any('Invalid JSON' in e for e in errors):
+        print("✗ Invalid UTF-8 team bytes should have failed validation")
+        return False
+    print("✓ Invalid UTF-8 team bytes rejected")
+
     return True
 
 
@@ -275,8 +389,9 @@ def main():
                 failed += 1
         except Exception as e:
             print(f"\n✗ {name} test crashed: {e}")
-            import traceback
-            traceback.print_exc()
+            if '-v' in sys.argv:
+                import traceback
+                traceback.print_exc()
             failed += 1
 
     print("\n" + "=" * 60)
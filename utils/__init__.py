@@ -7,7 +7,65 @@ validating data formats, and extracting metadata from parsed data.
 
 import json
 import os
-from typing import Dict, Any, Tuple, Optional
+from functools import lru_cache
+from typing import Dict, Any, Tuple, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_loads(content: Union[str, bytes]) -> Any:
+    """
+    Parse JSON text or UTF-8 bytes, using orjson when installed.
+    
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch
+    the same exception either way.
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def json_dumps(obj: Any, indent: bool = False) -> bytes:
+    """
+    Encode obj as UTF-8 JSON bytes, using orjson when installed.
+    
+    The stdlib path produces the same bytes as orjson: unescaped UTF-8 text,
+    non-string keys written as strings, and compact separators unless
+    indented (by two spaces).
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+@lru_cache(maxsize=None)
+def _yaml_loader():
+    """
+    Return (yaml module, safe loader class), resolved once.
+    
+    Prefers the libyaml-backed CSafeLoader when PyYAML was built with it.
+    Raises ImportError if PyYAML is not installed.
+    """
+    import yaml
+    return yaml, getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+def yaml_safe_load(content: str) -> Any:
+    """
+    yaml.safe_load, using the cached (C-accelerated when available) safe loader.
+    
+    Raises ImportError if PyYAML is not installed.
+    """
+    yaml, loader = _yaml_loader()
+    return yaml.load(content, Loader=loader)
 
 
 def read_file_content(file_path: str, encoding: str = 'utf-8') -> str:
@@ -26,36 +84,39 @@ def read_file_content(file_path: str, encoding: str = 'utf-8') -> str:
         UnicodeDecodeError: If encoding fails
         IOError: If reading fails
     """
-    try:
-        with open(file_path, 'r', encoding=encoding) as f:
-            return f.read()
-    except UnicodeDecodeError:
-        # Try alternative encodings if utf-8 fails
-        for alt_encoding in ['utf-8-sig', 'latin-1', 'cp1252']:
-            try:
-                with open(file_path, 'r', encoding=alt_encoding) as f:
-                    return f.read()
-            except UnicodeDecodeError:
-                continue
-        raise UnicodeDecodeError(f"Could not decode file {file_path} with any common encoding")
+    # Read the bytes once and try each decoder on the in-memory buffer rather
+    # than re-opening the file per encoding
+    with open(file_path, 'rb') as f:
+        data = f.read()
+
+    for candidate in (encoding, 'utf-8-sig', 'latin-1', 'cp1252'):
+        try:
+            text = data.decode(candidate)
+        except UnicodeDecodeError:
+            continue
+        # Match text-mode reads, which translate \r\n and \r to \n
+        return text.replace('\r\n', '\n').replace('\r', '\n')
+    raise UnicodeDecodeError(encoding, data, 0, len(data),
+                             f"Could not decode file {file_path} with any common encoding")
 
 
-def validate_json(content: str) -> Tuple[bool, Optional[Dict[str, Any]], Optional[str]]:
+def validate_json(content: Union[str, bytes]) -> Tuple[bool, Optional[Dict[str, Any]], Optional[str]]:
     """
     Validate JSON structure.
     
     Args:
-        content: JSON string to validate
+        content: JSON string to validate, or raw UTF-8 bytes (e.g. a file
+            read in 'rb' mode), which are parsed without decoding first
     
     Returns:
         tuple: (is_valid, parsed_data, error_message)
     """
     try:
-        data = json.loads(content)
+        data = json_loads(content)
         if not isinstance(data, dict):
             return False, None, "JSON must be an object/dictionary"
         return True, data, None
-    except json.JSONDecodeError as e:
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
         return False, None, f"Invalid JSON: {str(e)}"
 
 
@@ -70,17 +131,41 @@ def validate_yaml(content: str) -> Tuple[bool, Optional[Dict[str, Any]], Optiona
         tuple: (is_valid, parsed_data, error_message)
     """
     try:
-        import yaml
-        data = yaml.safe_load(content)
+        yaml, loader = _yaml_loader()
+    except ImportError:
+        return False, None, "PyYAML is not installed. Install it with: pip install PyYAML"
+    try:
+        data = yaml.load(content, Loader=loader)
         if not isinstance(data, dict):
             return False, None, "YAML must be a dictionary/object"
         return True, data, None
-    except ImportError:
-        return False, None, "PyYAML is not installed. Install it with: pip install PyYAML"
     except yaml.YAMLError as e:
         return False, None, f"Invalid YAML: {str(e)}"
 
 
+# Common metadata fields copied through by extract_metadata when present
+_METADATA_FIELDS = (
+    'name',
+    'description',
+    'version',
+    'author',
+    'category',
+    'tags',
+    'created_at',
+    'updated_at',
+    'license',
+    'source_url'
+)
+
+# Agent-specific fields extract_metadata always sets, and their defaults
+_AGENT_FIELD_DEFAULTS = (
+    ('capabilities', []),
+    ('tools', []),
+    ('system_prompt', None),
+    ('config_schema', None)
+)
+
+
 def extract_metadata(data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Extract common metadata from parsed agent data.
@@ -91,43 +176,23 @@ def extract_metadata(data: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         dict: Extracted metadata
     """
-    metadata = {}
-    
-    # Common metadata fields
-    metadata_fields = [
-        'name',
-        'description',
-        'version',
-        'author',
-        'category',
-        'tags',
-        'created_at',
-        'updated_at',
-        'license',
-        'source_url'
-    ]
-    
-    for field in metadata_fields:
-        if field in data:
-            metadata[field] = data[field]
-    
-    # Extract agent-specific fields
-    agent_fields = {
-        'capabilities': [],
-        'tools': [],
-        'system_prompt': None,
-        'config_schema': None
-    }
+    metadata = {field: data[field] for field in _METADATA_FIELDS if field in data}
     
-    for field, default in agent_fields.items():
+    # Agent-specific fields, with fresh copies of the list defaults so
+    # results never share them
+    for field, default in _AGENT_FIELD_DEFAULTS:
         if field in data:
             metadata[field] = data[field]
         else:
-            metadata[field] = default
+            metadata[field] = list(default) if isinstance(default, list) else default
     
     return metadata
 
 
+# Path separators become underscores; null bytes are removed
+_SANITIZE_TABLE = str.maketrans({'/': '_', '\\': '_', '\x00': None})
+
+
 def sanitize_filename(filename: str) -> str:
     """
     Sanitize filename to prevent path traversal and other issues.
@@ -138,16 +203,9 @@ def sanitize_filename(filename: str) -> str:
     Returns:
         str: Sanitized filename
     """
-    import re
-    
-    # Remove path separators
-    filename = filename.replace('/', '_').replace('\\', '_')
-    
-    # Remove null bytes
-    filename = filename.replace('\x00', '')
-    
-    # Remove leading/trailing dots and spaces
-    filename = filename.strip('. ')
+    # Replace path separators and drop null bytes in one pass, then remove
+    # leading/trailing dots and spaces
+    filename = filename.translate(_SANITIZE_TABLE).strip('. ')
     
     # Limit filename length
     if len(filename) > 255:
@@ -157,6 +215,9 @@ def sanitize_filename(filename: str) -> str:
     return filename
 
 
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+
 def get_file_size_human_readable(size_bytes: int) -> str:
     """
     Convert file size in bytes to human-readable format.
@@ -167,11 +228,10 @@ def get_file_size_human_readable(size_bytes: int) -> str:
     Returns:
         str: Human-readable file size (e.g., "1.5 KB", "2.3 MB")
     """
-    for unit in ['B', 'KB', 'MB', 'GB']:
-        if size_bytes < 1024.0:
-            return f"{size_bytes:.1f} {unit}"
-        size_bytes /= 1024.0
-    return f"{size_bytes:.1f} TB"
+    # Each unit is 2**10 times the previous one, so the unit index is the
+    # number of whole 10-bit groups above the lowest bit
+    index = min(max(int(size_bytes).bit_length() - 1, 0) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (10 * index)):.1f} {_SIZE_UNITS[index]}"
 
 
 def is_valid_file_format(filename: str, allowed_formats: list = None) -> bool:
@@ -212,11 +272,18 @@ def normalize_agent_data(data: Dict[str, Any]) -> Dict[str, Any]:
     for field in ['capabilities', 'tools', 'tags']:
         value = data.get(field)
         if isinstance(value, str):
-            # Try to parse JSON string
-            try:
-                normalized[field] = json.loads(value)
-            except:
-                # Split by comma if JSON parsing fails
+            # Only a JSON array/object is worth parsing; plain comma lists like
+            # "read, write" would just raise, so they skip the parser
+            parsed = None
+            if value.lstrip()[:1] in ('[', '{'):
+                try:
+                    parsed = json_loads(value)
+                except ValueError:
+                    pass
+            if parsed is not None:
+                normalized[field] = parsed
+            else:
+                # Split by comma if it isn't JSON
                 normalized[field] = [item.strip() for item in value.split(',')]
         elif isinstance(value, list):
             normalized[field] = value
@@ -238,7 +305,10 @@ def normalize_agent_data(data: Dict[str, Any]) -> Dict[str, Any]:
 
 
 # Export main functions
-__all__ = [
+__all__ = (
+    'json_loads',
+    'json_dumps',
+    'yaml_safe_load',
     'read_file_content',
     'validate_json',
     'validate_yaml',
@@ -247,4 +317,4 @@ __all__ = [
     'get_file_size_human_readable',
     'is_valid_file_format',
     'normalize_agent_data'
-]
+)
@@ -26,25 +26,31 @@ from .agent_validator import (
     validate_agent,
     validate_agent_strict,
     validate_agent_json,
+    validate_agent_bytes,
+    validate_agents_batch,
     AgentValidationError,
     VALID_TOOLS,
     VALID_MODELS,
-    SLUG_PATTERN
+    SLUG_PATTERN,
+    MAX_JSON_BYTES
 )
 
 from .team_validator import (
     validate_team,
     validate_team_strict,
     validate_team_json,
+    validate_teams_batch,
     TeamValidationError,
     VALID_WORKFLOW_TYPES
 )
 
-__all__ = [
+__all__ = (
     # Agent validation
     'validate_agent',
     'validate_agent_strict',
     'validate_agent_json',
+    'validate_agent_bytes',
+    'validate_agents_batch',
     'AgentValidationError',
     'VALID_TOOLS',
     'VALID_MODELS',
@@ -53,11 +59,13 @@ __all__ = [
     'validate_team',
     'validate_team_strict',
     'validate_team_json',
+    'validate_teams_batch',
     'TeamValidationError',
     'VALID_WORKFLOW_TYPES',
 
     # Common
-    'SLUG_PATTERN'
-]
+    'SLUG_PATTERN',
+    'MAX_JSON_BYTES'
+)
 
 __version__ = '1.0.0'
@@ -7,6 +7,9 @@ Agent Modes Database specification.
 """
 import re
 import json
+from concurrent.futures import ProcessPoolExecutor
+
+from utils import json_loads
 
 
 class AgentValidationError(Exception):
@@ -16,18 +19,50 @@ class AgentValidationError(Exception):
         super().__init__(f"Agent validation failed: {', '.join(errors)}")
 
 
-# Valid values
-VALID_TOOLS = ['Read', 'Write', 'Edit', 'Glob', 'Grep', 'Bash', 'Task', 'TodoWrite']
-VALID_MODELS = ['sonnet', 'haiku', 'opus']
+# Valid values, kept as frozensets for hashed membership checks (callers check
+# isinstance(value, str) first, since JSON lists/objects are unhashable).
+# Error messages list them in the documented order below
+_TOOL_NAMES = ('Read', 'Write', 'Edit', 'Glob', 'Grep', 'Bash', 'Task', 'TodoWrite')
+_MODEL_NAMES = ('sonnet', 'haiku', 'opus')
+VALID_TOOLS = frozenset(_TOOL_NAMES)
+VALID_MODELS = frozenset(_MODEL_NAMES)
+_VALID_TOOLS_STR = ', '.join(_TOOL_NAMES)
+_VALID_MODELS_STR = ', '.join(_MODEL_NAMES)
 SLUG_PATTERN = re.compile(r'^[a-z0-9-]+$')
 
+# Largest JSON document the *_json/*_bytes validators will parse. The field
+# limits add up to well under this, so anything bigger is rejected unparsed
+MAX_JSON_BYTES = 2 * 1024 * 1024
+
+
+class _StopValidation(Exception):
+    """Raised by a fail-fast error collector once the first error is recorded"""
+
+
+def _error_collector(errors, fail_fast):
+    """Return the add_error callback for the checks, appending to errors"""
+    if not fail_fast:
+        return errors.append
+
+    def add_error(message):
+        errors.append(message)
+        raise _StopValidation
 
-def validate_agent(config):
+    return add_error
+
+
+# Fields every agent config must set to a non-empty value
+_REQUIRED_FIELDS = ('slug', 'name', 'instructions', 'tools')
+
+
+def validate_agent(config, fail_fast=False):
     """
     Validate agent configuration
 
     Args:
         config: Agent configuration dict
+        fail_fast: Stop at the first error instead of collecting them all
+            (errors then holds at most one message)
 
     Returns:
         tuple: (is_valid: bool, errors: list)
@@ -43,94 +78,106 @@ def validate_agent(config):
         True
     """
     errors = []
+    try:
+        _check_agent(config, _error_collector(errors, fail_fast))
+    except _StopValidation:
+        pass
+    return len(errors) == 0, errors
+
+
+def _check_agent(config, add_error):
+    """Run the agent checks, reporting each problem through add_error"""
+    # Required fields, each looked up once and reused by the checks below
+    slug = config.get('slug')
+    name = config.get('name')
+    instructions = config.get('instructions')
+    tools = config.get('tools')
+    missing = [field for field, value in zip(_REQUIRED_FIELDS, (slug, name, instructions, tools))
+               if not value]
+    for field in missing:
+        add_error(f"Missing required field: {field}")
 
-    # Required fields
-    required_fields = ['slug', 'name', 'instructions', 'tools']
-    for field in required_fields:
-        if not config.get(field):
-            errors.append(f"Missing required field: {field}")
+    # Report missing fields on their own; the remaining checks assume a
+    # complete config
+    if missing:
+        return
 
     # Slug format validation
-    slug = config.get('slug', '')
-    if slug:
-        if not SLUG_PATTERN.match(slug):
-            errors.append("Slug must contain only lowercase letters, numbers, and hyphens")
+    # fullmatch, so a trailing newline doesn't slip past the pattern's '$'
+    if not SLUG_PATTERN.fullmatch(slug):
+        add_error("Slug must contain only lowercase letters, numbers, and hyphens")
 
-        if len(slug) < 3:
-            errors.append("Slug must be at least 3 characters")
+    if len(slug) < 3:
+        add_error("Slug must be at least 3 characters")
 
-        if len(slug) > 100:
-            errors.append("Slug must be less than 100 characters")
+    if len(slug) > 100:
+        add_error("Slug must be less than 100 characters")
 
     # Name validation
-    name = config.get('name', '')
-    if name and len(name) > 255:
-        errors.append("Name must be less than 255 characters")
+    if len(name) > 255:
+        add_error("Name must be less than 255 characters")
 
-    if name and len(name) < 2:
-        errors.append("Name must be at least 2 characters")
+    if len(name) < 2:
+        add_error("Name must be at least 2 characters")
 
     # Instructions validation
-    instructions = config.get('instructions', '')
-    if instructions and len(instructions) < 50:
-        errors.append("Instructions must be at least 50 characters (provide meaningful guidance)")
-
-    if instructions and len(instructions) > 10000:
-        errors.append("Instructions must be less than 10000 characters")
+    instructions_length = len(instructions)
+    if not 50 <= instructions_length <= 10000:
+        if instructions_length < 50:
+            add_error("Instructions must be at least 50 characters (provide meaningful guidance)")
+        else:
+            add_error("Instructions must be less than 10000 characters")
 
     # Tools validation
-    tools = config.get('tools', [])
     if not isinstance(tools, list):
-        errors.append("Tools must be an array")
+        add_error("Tools must be an array")
     else:
         if len(tools) == 0:
-            errors.append("At least one tool is required")
+            add_error("At least one tool is required")
 
         for tool in tools:
-            if tool not in VALID_TOOLS:
-                errors.append(f"Invalid tool: '{tool}'. Valid tools: {', '.join(VALID_TOOLS)}")
+            if not isinstance(tool, str) or tool not in VALID_TOOLS:
+                add_error(f"Invalid tool: '{tool}'. Valid tools: {_VALID_TOOLS_STR}")
 
     # Skills validation (optional)
     skills = config.get('skills', [])
     if skills is not None and not isinstance(skills, list):
-        errors.append("Skills must be an array")
+        add_error("Skills must be an array")
 
     # Model validation
     model = config.get('default_model', 'sonnet')
-    if model not in VALID_MODELS:
-        errors.append(f"Invalid model: '{model}'. Valid models: {', '.join(VALID_MODELS)}")
+    if not isinstance(model, str) or model not in VALID_MODELS:
+        add_error(f"Invalid model: '{model}'. Valid models: {_VALID_MODELS_STR}")
 
     # Max turns validation
     max_turns = config.get('max_turns', 50)
     if not isinstance(max_turns, int) or max_turns < 1 or max_turns > 1000:
-        errors.append("max_turns must be an integer between 1 and 1000")
+        add_error("max_turns must be an integer between 1 and 1000")
 
     # Allowed edit patterns validation (optional)
     patterns = config.get('allowed_edit_patterns', [])
     if patterns is not None and not isinstance(patterns, list):
-        errors.append("allowed_edit_patterns must be an array")
+        add_error("allowed_edit_patterns must be an array")
     else:
         # Validate regex patterns
         for pattern in patterns:
             if not isinstance(pattern, str):
-                errors.append(f"allowed_edit_patterns must contain strings, found: {type(pattern).__name__}")
+                add_error(f"allowed_edit_patterns must contain strings, found: {type(pattern).__name__}")
             else:
                 try:
                     re.compile(pattern)
                 except re.error as e:
-                    errors.append(f"Invalid regex pattern '{pattern}': {str(e)}")
+                    add_error(f"Invalid regex pattern '{pattern}': {str(e)}")
 
     # Description validation (optional but recommended)
     description = config.get('description', '')
     if description and len(description) > 1000:
-        errors.append("Description must be less than 1000 characters")
+        add_error("Description must be less than 1000 characters")
 
     # Category validation (optional)
     category = config.get('category', '')
     if category and len(category) > 100:
-        errors.append("Category must be less than 100 characters")
-
-    return len(errors) == 0, errors
+        add_error("Category must be less than 100 characters")
 
 
 def validate_agent_strict(config):
@@ -144,54 +191,100 @@ def validate_agent_strict(config):
         bool: True if valid
 
     Raises:
-        AgentValidationError: If validation fails with list of errors
+        AgentValidationError: If validation fails, with the first error found
+            (validation stops there, since only the failure matters here)
 
     Example:
         >>> try:
         ...     validate_agent_strict({'slug': 'test'})
         ... except AgentValidationError as e:
         ...     print(e.errors)
-        ['Missing required field: name', ...]
+        ['Missing required field: name']
     """
-    is_valid, errors = validate_agent(config)
+    is_valid, errors = validate_agent(config, fail_fast=True)
     if not is_valid:
         raise AgentValidationError(errors)
     return True
 
 
-def validate_agent_json(json_string):
+def validate_agent_bytes(data):
     """
-    Validate agent from JSON string
+    Validate agent from raw JSON bytes
+
+    The bytes are parsed directly (e.g. a file read in 'rb' mode or a
+    request body), without decoding them to a str first.
 
     Args:
-        json_string: JSON string to parse and validate
+        data: UTF-8 encoded JSON as bytes or bytearray (a str also works)
 
     Returns:
         tuple: (is_valid: bool, errors: list)
     """
-    errors = []
+    # Bound the parser's work before it allocates anything (for a str this
+    # counts characters, which never exceeds its UTF-8 size)
+    if len(data) > MAX_JSON_BYTES:
+        return False, [f"Payload exceeds {MAX_JSON_BYTES} bytes"]
 
-    # Parse JSON
+    # Parse JSON; the stdlib parser reports bad UTF-8 as UnicodeDecodeError
     try:
-        config = json.loads(json_string)
-    except json.JSONDecodeError as e:
-        errors.append(f"Invalid JSON: {str(e)}")
-        return False, errors
+        config = json_loads(data)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        return False, [f"Invalid JSON: {str(e)}"]
 
     # Validate config
-    is_valid, validation_errors = validate_agent(config)
-    errors.extend(validation_errors)
+    return validate_agent(config)
+
+
+def validate_agent_json(json_string):
+    """
+    Validate agent from JSON string
+
+    Args:
+        json_string: JSON string (or UTF-8 bytes) to parse and validate
+
+    Returns:
+        tuple: (is_valid: bool, errors: list)
+    """
+    # Both parsers accept str as well, so there's no need to encode it first
+    return validate_agent_bytes(json_string)
+
+
+# Batches smaller than this are validated serially; below it, starting
+# worker processes costs more than it saves
+_PARALLEL_BATCH_MIN = 200
+
+
+def validate_agents_batch(configs, workers=None):
+    """
+    Validate many agent configurations, in parallel for large batches
+
+    Validation is CPU-bound, so large batches are sharded across worker
+    processes; small ones run serially in this process.
+
+    Args:
+        configs: List of agent configuration dicts
+        workers: Maximum number of worker processes (default: CPU count)
+
+    Returns:
+        list: One (is_valid, errors) tuple per config, in input order
+    """
+    if len(configs) < _PARALLEL_BATCH_MIN:
+        return [validate_agent(config) for config in configs]
 
-    return is_valid, errors
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(validate_agent, configs, chunksize=64))
 
 
 # Export validation rules for external use
-__all__ = [
+__all__ = (
     'validate_agent',
     'validate_agent_strict',
     'validate_agent_json',
+    'validate_agent_bytes',
+    'validate_agents_batch',
     'AgentValidationError',
     'VALID_TOOLS',
     'VALID_MODELS',
-    'SLUG_PATTERN'
-]
+    'SLUG_PATTERN',
+    'MAX_JSON_BYTES'
+)
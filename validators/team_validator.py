@@ -4,9 +4,13 @@ Team configuration validator
 This module provides comprehensive validation for team configurations,
 ensuring proper structure, agent references, and workflow definitions.
 """
-import re
 import json
-from .agent_validator import SLUG_PATTERN
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from utils import json_loads
+from .agent_validator import (
+    MAX_JSON_BYTES, SLUG_PATTERN, _PARALLEL_BATCH_MIN, _StopValidation, _error_collector
+)
 
 
 class TeamValidationError(Exception):
@@ -16,16 +20,25 @@ class TeamValidationError(Exception):
         super().__init__(f"Team validation failed: {', '.join(errors)}")
 
 
-VALID_WORKFLOW_TYPES = ['sequential', 'parallel', 'orchestrated']
+# Kept as a frozenset for hashed membership checks; error messages list the
+# types in the documented order
+_WORKFLOW_TYPE_NAMES = ('sequential', 'parallel', 'orchestrated')
+VALID_WORKFLOW_TYPES = frozenset(_WORKFLOW_TYPE_NAMES)
 
 
-def validate_team(config, agent_exists_fn=None):
+# Fields every team config must set to a non-empty value
+_REQUIRED_FIELDS = ('slug', 'name', 'agents')
+
+
+def validate_team(config, agent_exists_fn=None, fail_fast=False):
     """
     Validate team configuration
 
     Args:
         config: Team configuration dict
         agent_exists_fn: Optional function to check if agent exists (slug -> bool)
+        fail_fast: Stop at the first error instead of collecting them all
+            (errors then holds at most one message)
 
     Returns:
         tuple: (is_valid: bool, errors: list)
@@ -45,163 +58,175 @@ def validate_team(config, agent_exists_fn=None):
         True
     """
     errors = []
+    try:
+        _check_team(config, agent_exists_fn, _error_collector(errors, fail_fast))
+    except _StopValidation:
+        pass
+    return len(errors) == 0, errors
 
-    # Required fields
-    required_fields = ['slug', 'name', 'agents']
-    for field in required_fields:
-        if not config.get(field):
-            errors.append(f"Missing required field: {field}")
 
-    # Slug validation
+def _check_team(config, agent_exists_fn, add_error):
+    """Run the team checks, reporting each problem through add_error"""
+    # fullmatch, so a trailing newline doesn't slip past the pattern's '$'
+    slug_match = SLUG_PATTERN.fullmatch
+
+    # Required fields, each looked up once and reused by the checks below
     slug = config.get('slug', '')
+    name = config.get('name', '')
+    agents = config.get('agents', [])
+    for field, value in zip(_REQUIRED_FIELDS, (slug, name, agents)):
+        if not value:
+            add_error(f"Missing required field: {field}")
+
+    # Slug validation
     if slug:
-        if not SLUG_PATTERN.match(slug):
-            errors.append("Slug must contain only lowercase letters, numbers, and hyphens")
+        if not slug_match(slug):
+            add_error("Slug must contain only lowercase letters, numbers, and hyphens")
 
         if len(slug) < 3:
-            errors.append("Slug must be at least 3 characters")
+            add_error("Slug must be at least 3 characters")
 
         if len(slug) > 100:
-            errors.append("Slug must be less than 100 characters")
+            add_error("Slug must be less than 100 characters")
 
     # Name validation
-    name = config.get('name', '')
     if name:
         if len(name) > 255:
-            errors.append("Name must be less than 255 characters")
+            add_error("Name must be less than 255 characters")
 
         if len(name) < 2:
-            errors.append("Name must be at least 2 characters")
+            add_error("Name must be at least 2 characters")
 
     # Description validation (optional)
     description = config.get('description', '')
     if description and len(description) > 1000:
-        errors.append("Description must be less than 1000 characters")
+        add_error("Description must be less than 1000 characters")
 
-    # Agents validation
-    agents = config.get('agents', [])
+    # Agents validation; the slugs collected here back the orchestrator and
+    # workflow stage membership checks below
+    agent_slugs = []
     if not isinstance(agents, list):
-        errors.append("Agents must be an array")
+        add_error("Agents must be an array")
     else:
         if len(agents) == 0:
-            errors.append("Team must have at least one agent")
+            add_error("Team must have at least one agent")
 
         if len(agents) > 50:
-            errors.append("Team cannot have more than 50 agents")
+            add_error("Team cannot have more than 50 agents")
 
-        agent_slugs = []
         for i, agent in enumerate(agents):
             if not isinstance(agent, dict):
-                errors.append(f"Agent at index {i} must be an object")
+                add_error(f"Agent at index {i} must be an object")
                 continue
 
             # Required agent fields
             if 'slug' not in agent:
-                errors.append(f"Agent at index {i} missing 'slug' field")
+                add_error(f"Agent at index {i} missing 'slug' field")
             else:
                 agent_slug = agent['slug']
-                agent_slugs.append(agent_slug)
 
-                # Validate agent slug format
-                if not SLUG_PATTERN.match(agent_slug):
-                    errors.append(f"Agent at index {i} has invalid slug format: '{agent_slug}'")
+                # Validate agent slug format; only string slugs are collected,
+                # since the duplicate and membership checks below hash them
+                if not isinstance(agent_slug, str) or not slug_match(agent_slug):
+                    add_error(f"Agent at index {i} has invalid slug format: '{agent_slug}'")
 
-                # Check if agent exists (if function provided)
-                if agent_exists_fn and not agent_exists_fn(agent_slug):
-                    errors.append(f"Agent '{agent_slug}' does not exist")
+                if isinstance(agent_slug, str):
+                    agent_slugs.append(agent_slug)
+
+                    # Check if agent exists (if function provided)
+                    if agent_exists_fn and not agent_exists_fn(agent_slug):
+                        add_error(f"Agent '{agent_slug}' does not exist")
 
             # Optional but recommended fields
             if 'role' not in agent:
-                errors.append(f"Agent at index {i} should have a 'role' field")
+                add_error(f"Agent at index {i} should have a 'role' field")
             else:
                 role = agent['role']
                 if not isinstance(role, str):
-                    errors.append(f"Agent at index {i} role must be a string")
+                    add_error(f"Agent at index {i} role must be a string")
                 elif len(role) > 100:
-                    errors.append(f"Agent at index {i} role must be less than 100 characters")
+                    add_error(f"Agent at index {i} role must be less than 100 characters")
 
             # Validate priority if present
             if 'priority' in agent:
                 priority = agent['priority']
                 if not isinstance(priority, int) or priority < 0 or priority > 100:
-                    errors.append(f"Agent at index {i} priority must be an integer between 0 and 100")
+                    add_error(f"Agent at index {i} priority must be an integer between 0 and 100")
 
         # Check for duplicate agents
-        if len(agent_slugs) != len(set(agent_slugs)):
-            duplicates = [slug for slug in agent_slugs if agent_slugs.count(slug) > 1]
-            errors.append(f"Duplicate agents in team: {', '.join(set(duplicates))}")
+        # (Counter keeps first-seen order, so duplicates are listed in team order)
+        duplicates = [slug for slug, count in Counter(agent_slugs).items() if count > 1]
+        if duplicates:
+            add_error(f"Duplicate agents in team: {', '.join(duplicates)}")
+
+    team_agent_slugs = frozenset(agent_slugs)
 
     # Orchestrator validation
     orchestrator = config.get('orchestrator')
     if orchestrator:
         if not isinstance(orchestrator, str):
-            errors.append("Orchestrator must be a string (agent slug)")
+            add_error("Orchestrator must be a string (agent slug)")
         else:
-            if not SLUG_PATTERN.match(orchestrator):
-                errors.append(f"Orchestrator has invalid slug format: '{orchestrator}'")
+            if not slug_match(orchestrator):
+                add_error(f"Orchestrator has invalid slug format: '{orchestrator}'")
 
             if agent_exists_fn and not agent_exists_fn(orchestrator):
-                errors.append(f"Orchestrator agent '{orchestrator}' does not exist")
+                add_error(f"Orchestrator agent '{orchestrator}' does not exist")
 
             # Check if orchestrator is in the team
-            agents = config.get('agents', [])
-            orchestrator_in_team = any(a.get('slug') == orchestrator for a in agents if isinstance(a, dict))
-            if not orchestrator_in_team:
-                errors.append(f"Orchestrator agent '{orchestrator}' must be part of the team")
+            if orchestrator not in team_agent_slugs:
+                add_error(f"Orchestrator agent '{orchestrator}' must be part of the team")
 
     # Workflow validation
     workflow = config.get('workflow', {})
     if workflow:
         if not isinstance(workflow, dict):
-            errors.append("Workflow must be an object")
+            add_error("Workflow must be an object")
         else:
             workflow_type = workflow.get('type')
             if workflow_type:
-                if workflow_type not in VALID_WORKFLOW_TYPES:
-                    errors.append(f"Invalid workflow type: '{workflow_type}'. Valid types: {', '.join(VALID_WORKFLOW_TYPES)}")
+                if not isinstance(workflow_type, str) or workflow_type not in VALID_WORKFLOW_TYPES:
+                    add_error(f"Invalid workflow type: '{workflow_type}'. Valid types: {', '.join(_WORKFLOW_TYPE_NAMES)}")
 
             # Validate stages if present
             stages = workflow.get('stages', [])
             if stages:
                 if not isinstance(stages, list):
-                    errors.append("Workflow stages must be an array")
+                    add_error("Workflow stages must be an array")
                 else:
                     for i, stage in enumerate(stages):
                         if not isinstance(stage, dict):
-                            errors.append(f"Workflow stage at index {i} must be an object")
+                            add_error(f"Workflow stage at index {i} must be an object")
                             continue
 
                         # Validate stage name
                         if 'name' not in stage:
-                            errors.append(f"Workflow stage at index {i} missing 'name' field")
+                            add_error(f"Workflow stage at index {i} missing 'name' field")
                         elif len(stage['name']) > 100:
-                            errors.append(f"Workflow stage at index {i} name must be less than 100 characters")
+                            add_error(f"Workflow stage at index {i} name must be less than 100 characters")
 
                         # Validate stage agents
                         if 'agents' in stage:
                             stage_agents = stage['agents']
                             if not isinstance(stage_agents, list):
-                                errors.append(f"Workflow stage at index {i} agents must be an array")
+                                add_error(f"Workflow stage at index {i} agents must be an array")
                             else:
                                 # Check that stage agents are in the team
-                                team_agent_slugs = [a.get('slug') for a in config.get('agents', []) if isinstance(a, dict)]
                                 for stage_agent in stage_agents:
-                                    if stage_agent not in team_agent_slugs:
-                                        errors.append(f"Workflow stage at index {i} references unknown agent: '{stage_agent}'")
+                                    if not isinstance(stage_agent, str) or stage_agent not in team_agent_slugs:
+                                        add_error(f"Workflow stage at index {i} references unknown agent: '{stage_agent}'")
 
     # Max concurrent tasks validation (optional)
     max_concurrent = config.get('max_concurrent_tasks')
     if max_concurrent is not None:
         if not isinstance(max_concurrent, int) or max_concurrent < 1 or max_concurrent > 100:
-            errors.append("max_concurrent_tasks must be an integer between 1 and 100")
+            add_error("max_concurrent_tasks must be an integer between 1 and 100")
 
     # Timeout validation (optional)
     timeout = config.get('timeout')
     if timeout is not None:
         if not isinstance(timeout, (int, float)) or timeout <= 0:
-            errors.append("timeout must be a positive number")
-
-    return len(errors) == 0, errors
+            add_error("timeout must be a positive number")
 
 
 def validate_team_strict(config, agent_exists_fn=None):
@@ -216,16 +241,17 @@ def validate_team_strict(config, agent_exists_fn=None):
         bool: True if valid
 
     Raises:
-        TeamValidationError: If validation fails with list of errors
+        TeamValidationError: If validation fails, with the first error found
+            (validation stops there, since only the failure matters here)
 
     Example:
         >>> try:
         ...     validate_team_strict({'slug': 'test'})
         ... except TeamValidationError as e:
         ...     print(e.errors)
-        ['Missing required field: name', ...]
+        ['Missing required field: name']
     """
-    is_valid, errors = validate_team(config, agent_exists_fn)
+    is_valid, errors = validate_team(config, agent_exists_fn, fail_fast=True)
     if not is_valid:
         raise TeamValidationError(errors)
     return True
@@ -236,7 +262,7 @@ def validate_team_json(json_string, agent_exists_fn=None):
     Validate team from JSON string
 
     Args:
-        json_string: JSON string to parse and validate
+        json_string: JSON string (or UTF-8 bytes) to parse and validate
         agent_exists_fn: Optional function to check if agent exists (slug -> bool)
 
     Returns:
@@ -244,10 +270,15 @@ def validate_team_json(json_string, agent_exists_fn=None):
     """
     errors = []
 
-    # Parse JSON
+    # Reject oversized payloads before parsing them
+    if len(json_string) > MAX_JSON_BYTES:
+        errors.append(f"Payload exceeds {MAX_JSON_BYTES} bytes")
+        return False, errors
+
+    # Parse JSON; the stdlib parser reports bad UTF-8 bytes as UnicodeDecodeError
     try:
-        config = json.loads(json_string)
-    except json.JSONDecodeError as e:
+        config = json_loads(json_string)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
         errors.append(f"Invalid JSON: {str(e)}")
         return False, errors
 
@@ -258,11 +289,36 @@ def validate_team_json(json_string, agent_exists_fn=None):
     return is_valid, errors
 
 
+def validate_teams_batch(configs, agent_exists_fn=None, workers=None):
+    """
+    Validate many team configurations, concurrently for large batches
+
+    Uses threads rather than processes: agent_exists_fn usually queries
+    the database, so the time goes to I/O, and a closure over a database
+    handle can't be sent to another process anyway. Small batches run
+    serially in the calling thread, like validate_agents_batch.
+
+    Args:
+        configs: List of team configuration dicts
+        agent_exists_fn: Optional function to check if agent exists (slug -> bool)
+        workers: Maximum number of worker threads
+
+    Returns:
+        list: One (is_valid, errors) tuple per config, in input order
+    """
+    if len(configs) < _PARALLEL_BATCH_MIN:
+        return [validate_team(config, agent_exists_fn) for config in configs]
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(lambda config: validate_team(config, agent_exists_fn), configs))
+
+
 # Export validation rules for external use
-__all__ = [
+__all__ = (
     'validate_team',
     'validate_team_strict',
     'validate_team_json',
+    'validate_teams_batch',
     'TeamValidationError',
     'VALID_WORKFLOW_TYPES'
-]
+)